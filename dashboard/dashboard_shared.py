@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the Flask dashboards
+"""
+
+import psutil
+
+# Try to import orjson for faster JSON encoding, fallback to stdlib json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    orjson = None
+
+class OrjsonModule:
+    """json-module shim so SocketIO packets are encoded with orjson"""
+    
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+    
+    @staticmethod
+    def loads(data, **kwargs):
+        return orjson.loads(data)
+
+def socketio_json_options() -> dict:
+    """SocketIO keyword arguments selecting orjson when it is installed"""
+    return {'json': OrjsonModule} if HAS_ORJSON else {}
+
+def prime_cpu_percent():
+    """Prime cpu_percent so later interval=None calls return a real delta"""
+    psutil.cpu_percent(interval=None)
@@ -5,9 +5,12 @@ Provides web-based monitoring, control, and management interface
 """
 
 import asyncio
+import glob
 import json
 import logging
+import mmap
 import os
+import re
 import sys
 import threading
 import time
@@ -28,11 +31,43 @@ from mcp_tools import MCPToolsManager
 from monitoring_system import MonitoringSystem
 from session_manager import SessionManager
 
+# Shared dashboard helpers; top-level when run from dashboard/, else via the package
+try:
+    from dashboard_shared import prime_cpu_percent, socketio_json_options
+except ImportError:
+    from dashboard.dashboard_shared import prime_cpu_percent, socketio_json_options
+
 logger = logging.getLogger(__name__)
 
 # Thread pool for async operations
 executor = None
 
+# Disk fill level changes slowly; resample at most this often
+DISK_USAGE_CACHE_SECONDS = 30.0
+
+# Only the tail of each log is inspected for the architecture marker
+ARCH_LOG_TAIL_BYTES = 4096
+ARCH_MARKER = b'Architecture: '
+ARCH_PATTERN = re.compile(rb'Architecture: (\w+)')
+
+def _read_architecture_from_log(log_file: str) -> Optional[str]:
+    """Return the last architecture logged in the tail of log_file, if any"""
+    with open(log_file, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return None
+        
+        # mmap offsets must be aligned to the allocation granularity
+        offset = max(0, size - ARCH_LOG_TAIL_BYTES) & ~(mmap.ALLOCATIONGRANULARITY - 1)
+        with mmap.mmap(f.fileno(), length=size - offset, offset=offset,
+                       access=mmap.ACCESS_READ) as mm:
+            index = mm.rfind(ARCH_MARKER)
+            if index == -1:
+                return None
+            
+            arch_match = ARCH_PATTERN.match(mm, index)
+            return arch_match.group(1).decode('ascii', errors='ignore') if arch_match else None
+
 class FlaskDashboard:
     """Flask web dashboard for Ollama Flow Framework"""
     
@@ -47,22 +82,35 @@ class FlaskDashboard:
                         static_folder='static')
         self.app.config['SECRET_KEY'] = 'ollama-flow-dashboard-2024'
         
+        # Let a fronting proxy (nginx/Apache) stream static assets with sendfile(2).
+        # Only enable behind a proxy that honours X-Sendfile, otherwise bodies are empty.
+        self.app.config['USE_X_SENDFILE'] = os.getenv('OLLAMA_DASHBOARD_X_SENDFILE') == 'true'
+        
         # SocketIO for real-time updates
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        self.socketio = SocketIO(self.app, cors_allowed_origins="*", **socketio_json_options())
         
         # Enhanced components
         self.framework: Optional[EnhancedOllamaFlow] = None
+        self._framework_template: Optional[EnhancedOllamaFlow] = None
         self.neural_engine: Optional[NeuralIntelligenceEngine] = None
         self.mcp_tools: Optional[MCPToolsManager] = None
         self.monitoring_system: Optional[MonitoringSystem] = None
         self.session_manager: Optional[SessionManager] = None
         
         # Dashboard state
-        self.is_running = False
+        self._run_lock = threading.Lock()  # Held for the lifetime of a task execution
         self.current_task = None
         self.execution_thread = None
         self.update_thread = None
         
+        # Cached disk usage (value, sampled_at)
+        self._disk_percent_cache = (0.0, 0.0)
+        
+        # Latest metrics sampled by the update thread, served by /api/status
+        self.system_metrics: Dict[str, Any] = {}
+        
+        prime_cpu_percent()
+        
         # Setup routes
         self._setup_routes()
         self._setup_socketio_events()
@@ -73,11 +121,19 @@ class FlaskDashboard:
         # Initialize components (delayed until run)
         self.components_initialized = False
     
+    @property
+    def is_running(self) -> bool:
+        """Whether a task holds _run_lock; the lock is the single source of truth"""
+        return self._run_lock.locked()
+    
     def _initialize_components_simple(self):
         """Initialize enhanced components (simplified)"""
         try:
             # Initialize without async for now
             logger.info("Initializing dashboard components (simplified mode)")
+            
+            # Construct the framework once so task starts only reconfigure it
+            self._framework_template = EnhancedOllamaFlow()
             self.components_initialized = True
             
         except Exception as e:
@@ -126,6 +182,9 @@ class FlaskDashboard:
         def api_status():
             """Get system status"""
             try:
+                # Reuse the update thread's sample; only sample here before its first tick
+                metrics = self.system_metrics or self._sample_system_metrics()
+                
                 status = {
                     'system': {
                         'running': self.is_running,
@@ -134,10 +193,10 @@ class FlaskDashboard:
                         'components_initialized': self.components_initialized
                     },
                     'resources': {
-                        'cpu_percent': psutil.cpu_percent(interval=0.1),
-                        'memory_percent': psutil.virtual_memory().percent,
-                        'disk_percent': psutil.disk_usage('/').percent,
-                        'processes': len(psutil.pids())
+                        'cpu_percent': metrics['cpu_percent'],
+                        'memory_percent': metrics['memory_percent'],
+                        'disk_percent': metrics['disk_percent'],
+                        'processes': metrics['processes']
                     }
                 }
                 
@@ -282,15 +341,23 @@ class FlaskDashboard:
                 model = data.get('model', 'codellama:7b')
                 secure = data.get('secure', True)
                 
-                if self.is_running:
+                # Atomic check-and-set; released by _execute_task_background
+                if not self._run_lock.acquire(blocking=False):
                     return jsonify({'error': 'Another task is already running'}), 409
                 
+                self.current_task = task
+                
                 # Start task execution in background thread
-                self.execution_thread = threading.Thread(
-                    target=self._execute_task_background,
-                    args=(task, workers, architecture, model, secure)
-                )
-                self.execution_thread.start()
+                try:
+                    self.execution_thread = threading.Thread(
+                        target=self._execute_task_background,
+                        args=(task, workers, architecture, model, secure)
+                    )
+                    self.execution_thread.start()
+                except Exception:
+                    self.current_task = None
+                    self._run_lock.release()
+                    raise
                 
                 return jsonify({
                     'message': 'Task execution started',
@@ -315,9 +382,8 @@ class FlaskDashboard:
                     loop.run_until_complete(self.framework.stop_all_agents())
                     loop.close()
                 
-                self.is_running = False
-                self.current_task = None
-                
+                # The worker thread releases _run_lock and clears current_task
+                # once the task actually winds down
                 return jsonify({'message': 'Task execution stopped'})
                 
             except Exception as e:
@@ -353,9 +419,6 @@ class FlaskDashboard:
         
         # Try to detect from recent logs or processes
         try:
-            import glob
-            import re
-            
             log_patterns = [
                 "/home/oliver/Projects/ollama-flow/**/*.log",
                 "./**.log"
@@ -364,12 +427,9 @@ class FlaskDashboard:
             for pattern in log_patterns:
                 for log_file in glob.glob(pattern, recursive=True):
                     try:
-                        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = f.read()[-1000:]  # Last 1000 chars
-                            
-                        arch_match = re.search(r'Architecture: (\w+)', content)
-                        if arch_match:
-                            return arch_match.group(1)
+                        architecture = _read_architecture_from_log(log_file)
+                        if architecture:
+                            return architecture
                     except:
                         continue
         except:
@@ -474,11 +534,8 @@ class FlaskDashboard:
     
     def _execute_task_background(self, task: str, workers: int, architecture: str, 
                                 model: str, secure: bool):
-        """Execute task in background thread"""
+        """Execute task in background thread (caller must hold self._run_lock)"""
         try:
-            self.is_running = True
-            self.current_task = task
-            
             # Emit task started event
             self.socketio.emit('task_started', {
                 'task': task,
@@ -492,10 +549,13 @@ class FlaskDashboard:
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             
-            self.framework = EnhancedOllamaFlow()
+            if self._framework_template is None:
+                self._framework_template = EnhancedOllamaFlow()
+            self.framework = self._framework_template
             
-            # Configure framework
-            self.framework.config = {
+            # Configure framework in place
+            self.framework.config.clear()
+            self.framework.config.update({
                 'worker_count': workers,
                 'architecture_type': architecture,
                 'model': model,
@@ -506,7 +566,7 @@ class FlaskDashboard:
                 'benchmark_mode': True,
                 'db_path': 'ollama_flow_messages.db',
                 'log_level': 'INFO'
-            }
+            })
             
             # Run task
             success = loop.run_until_complete(self.framework.run_single_task(task))
@@ -528,20 +588,40 @@ class FlaskDashboard:
                 'timestamp': datetime.now().isoformat()
             })
         finally:
-            self.is_running = False
             self.current_task = None
+            self._run_lock.release()
+    
+    def _get_disk_percent(self) -> float:
+        """Get disk usage percent, resampled at most every DISK_USAGE_CACHE_SECONDS"""
+        value, sampled_at = self._disk_percent_cache
+        now = time.monotonic()
+        if not sampled_at or now - sampled_at >= DISK_USAGE_CACHE_SECONDS:
+            value = psutil.disk_usage('/').percent
+            self._disk_percent_cache = (value, now)
+        return value
+    
+    def _sample_system_metrics(self) -> Dict[str, Any]:
+        """Sample system resources without blocking"""
+        # Single virtual_memory() sample shared by all memory fields
+        mem = psutil.virtual_memory()
+        
+        return {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': mem.percent,
+            'memory_available': mem.available,
+            'memory_total': mem.total,
+            'disk_percent': self._get_disk_percent(),
+            'processes': len(psutil.pids()),
+            'network_io': psutil.net_io_counters()._asdict(),
+            'timestamp': datetime.now().isoformat()
+        }
     
     def _emit_system_update(self):
         """Emit system status update"""
         try:
-            # Get system resources
-            system_data = {
-                'cpu_percent': psutil.cpu_percent(interval=1),
-                'memory_percent': psutil.virtual_memory().percent,
-                'disk_percent': psutil.disk_usage('/').percent,
-                'network_io': psutil.net_io_counters()._asdict(),
-                'timestamp': datetime.now().isoformat()
-            }
+            # Get system resources and cache them for /api/status
+            system_data = self._sample_system_metrics()
+            self.system_metrics = system_data
             
             self.socketio.emit('system_update', system_data)
             
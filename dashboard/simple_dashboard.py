@@ -6,15 +6,28 @@ Simplified version without async complications
 
 import os
 import sys
+import shlex
+import asyncio
 import json
 import time
 import threading
+from collections import deque
 from datetime import datetime
+from string import Template
 from typing import Dict, Any, Optional
 
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+from markupsafe import escape
 import psutil
 
+# Try to import Flask-Compress for gzip/brotli responses, fallback to uncompressed
+try:
+    from flask_compress import Compress
+    HAS_COMPRESS = True
+except ImportError:
+    HAS_COMPRESS = False
+    Compress = None
+
 # Try to import SocketIO, fallback if not available
 try:
     from flask_socketio import SocketIO, emit
@@ -26,88 +39,70 @@ except ImportError:
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Shared dashboard helpers; top-level when run from dashboard/, else via the package
+try:
+    from dashboard_shared import HAS_ORJSON, orjson, prime_cpu_percent, socketio_json_options
+except ImportError:
+    from dashboard.dashboard_shared import HAS_ORJSON, orjson, prime_cpu_percent, socketio_json_options
+
 import logging
 logger = logging.getLogger(__name__)
 
-class SimpleDashboard:
-    """Simple Flask web dashboard for Ollama Flow Framework"""
-    
-    def __init__(self, host='localhost', port=5000, debug=False):
-        """Initialize simple dashboard"""
-        self.host = host
-        self.port = port
-        self.debug = debug
-        
-        # Flask app setup
-        self.app = Flask(__name__)
-        self.app.config['SECRET_KEY'] = 'ollama-flow-dashboard-secret'
-        
-        # Setup SocketIO if available
-        if HAS_SOCKETIO:
-            self.socketio = SocketIO(self.app, cors_allowed_origins="*")
-        else:
-            self.socketio = None
-        
-        # Dashboard state
-        self.is_running = False
-        self.current_task = None
-        self.task_history = []
-        self.system_metrics = {}
-        self.update_thread = None
-        
-        # Session management
-        self.active_sessions = {}
-        self.session_history = []
-        
-        # Setup routes
-        self._setup_routes()
-        
-        # Setup SocketIO events if available
-        if HAS_SOCKETIO:
-            self._setup_socketio_events()
+def ojsonify(obj, status=200):
+    """Build a JSON response, serialized with orjson when available"""
+    if HAS_ORJSON:
+        return Response(orjson.dumps(obj), status=status, mimetype='application/json')
     
-    def _render_page(self, title, content):
-        """Render a page with common layout"""
-        return f"""
+    response = jsonify(obj)
+    response.status_code = status
+    return response
+
+# Finished sessions kept in memory, and how many of them the API returns
+SESSION_HISTORY_LIMIT = 500
+SESSION_HISTORY_API_LIMIT = 50
+
+# Fields the session list API returns; full sessions come from /api/sessions/<id>
+SESSION_LIST_FIELDS = ('id', 'name', 'status', 'workers', 'architecture', 'started_at')
+SESSION_HISTORY_FIELDS = SESSION_LIST_FIELDS + ('duration',)
+
+# SocketIO async mode ('gevent', 'eventlet' or 'threading'); unset lets
+# Flask-SocketIO pick the best installed server
+SOCKETIO_ASYNC_MODE = os.getenv('OLLAMA_DASHBOARD_ASYNC_MODE') or None
+
+# Seconds between metrics samples and system_update pushes; clients only
+# poll without SocketIO
+SYSTEM_UPDATE_INTERVAL = 1.0
+
+# Page titles with a navigation entry; their page shells are prebuilt
+DASHBOARD_TITLE = "System Dashboard"
+SESSIONS_TITLE = "Session Management"
+
+# Shared stylesheet and client-side script, served as cacheable static files
+_STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+_BASE_CSS_FILE = 'simple_dashboard.css'
+_BASE_JS_FILE = 'simple_dashboard.js'
+
+# Browsers may reuse static assets for 12 hours; URLs carry a version to bust the cache
+STATIC_MAX_AGE = 43200
+
+def _static_asset_url(static_url_path, filename):
+    """Return a versioned URL for a static asset so edits bypass browser caches"""
+    try:
+        version = int(os.path.getmtime(os.path.join(_STATIC_DIR, filename)))
+    except OSError:
+        version = 0
+    return f"{static_url_path}/{filename}?v={version}"
+
+def _build_page_shell(title, static_url_path='/static'):
+    """Build the (prefix, suffix) halves of the page layout around the content"""
+    css_url = _static_asset_url(static_url_path, _BASE_CSS_FILE)
+    js_url = _static_asset_url(static_url_path, _BASE_JS_FILE)
+    prefix = f"""
             <!DOCTYPE html>
             <html>
             <head>
                 <title>Ollama Flow - {title}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 0; padding: 0; background: #f5f5f5; }}
-                    .header {{ background: #343a40; color: white; padding: 1rem 0; }}
-                    .header .container {{ max-width: 1200px; margin: 0 auto; padding: 0 20px; }}
-                    .nav {{ margin-top: 10px; }}
-                    .nav a {{ color: #adb5bd; text-decoration: none; margin-right: 20px; padding: 5px 10px; border-radius: 4px; }}
-                    .nav a:hover, .nav a.active {{ background: #495057; color: white; }}
-                    .container {{ max-width: 1200px; margin: 0 auto; padding: 20px; }}
-                    .card {{ background: white; padding: 20px; margin: 20px 0; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-                    .metric {{ display: inline-block; margin: 10px 20px; }}
-                    .status {{ color: #28a745; font-weight: bold; }}
-                    .error {{ color: #dc3545; }}
-                    .warning {{ color: #ffc107; }}
-                    h1 {{ color: #333; margin: 0; }}
-                    h2 {{ color: #666; }}
-                    .btn {{ padding: 8px 16px; margin: 5px; border: none; border-radius: 4px; cursor: pointer; text-decoration: none; display: inline-block; }}
-                    .btn-primary {{ background: #007bff; color: white; }}
-                    .btn-success {{ background: #28a745; color: white; }}
-                    .btn-danger {{ background: #dc3545; color: white; }}
-                    .btn-secondary {{ background: #6c757d; color: white; }}
-                    .btn-sm {{ padding: 4px 8px; font-size: 0.875rem; }}
-                    .btn:hover {{ opacity: 0.8; }}
-                    .btn:disabled {{ opacity: 0.5; cursor: not-allowed; }}
-                    .form-group {{ margin: 15px 0; }}
-                    .form-group label {{ display: block; margin-bottom: 5px; font-weight: bold; }}
-                    .form-group input, .form-group select, .form-group textarea {{ width: 100%; padding: 8px; border: 1px solid #ddd; border-radius: 4px; box-sizing: border-box; }}
-                    .form-group textarea {{ height: 100px; resize: vertical; }}
-                    .session-item {{ border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 4px; }}
-                    .session-item.running {{ border-color: #28a745; background: #f8fff9; }}
-                    .session-item.stopped {{ border-color: #6c757d; background: #f8f9fa; }}
-                    .session-header {{ display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px; }}
-                    .session-meta {{ font-size: 0.9em; color: #666; }}
-                    .two-column {{ display: grid; grid-template-columns: 1fr 1fr; gap: 20px; }}
-                    @media (max-width: 768px) {{ .two-column {{ grid-template-columns: 1fr; }} }}
-                </style>
+                <link rel="stylesheet" href="{css_url}">
                 <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.0.1/socket.io.js"></script>
             </head>
             <body>
@@ -115,211 +110,23 @@ class SimpleDashboard:
                     <div class="container">
                         <h1>🚀 Ollama Flow Dashboard</h1>
                         <div class="nav">
-                            <a href="/" class="{'active' if title == 'System Dashboard' else ''}">System Overview</a>
-                            <a href="/sessions" class="{'active' if title == 'Session Management' else ''}">Sessions</a>
+                            <a href="/" class="{'active' if title == DASHBOARD_TITLE else ''}">System Overview</a>
+                            <a href="/sessions" class="{'active' if title == SESSIONS_TITLE else ''}">Sessions</a>
                         </div>
                     </div>
                 </div>
                 <div class="container">
-                    {content}
+                    """
+    suffix = f"""
                 </div>
-                <script>
-                    // Common JavaScript functions
-                    const socket = typeof io !== 'undefined' ? io() : null;
-                    
-                    if (socket) {{
-                        socket.on('connect', function() {{
-                            console.log('Connected to dashboard');
-                        }});
-                        
-                        socket.on('system_update', function(data) {{
-                            updateSystemStatus(data);
-                        }});
-                    }}
-                    
-                    function updateSystemStatus(data) {{
-                        if (data.system && document.getElementById('status')) {{
-                            document.getElementById('status').textContent = data.system.running ? 'Running' : 'Stopped';
-                            if (document.getElementById('timestamp')) {{
-                                document.getElementById('timestamp').textContent = 'Last updated: ' + data.system.timestamp;
-                            }}
-                        }}
-                        if (data.resources) {{
-                            if (document.getElementById('cpu')) document.getElementById('cpu').textContent = data.resources.cpu_percent.toFixed(1);
-                            if (document.getElementById('memory')) document.getElementById('memory').textContent = data.resources.memory_percent.toFixed(1);
-                            if (document.getElementById('disk')) document.getElementById('disk').textContent = data.resources.disk_percent.toFixed(1);
-                        }}
-                    }}
-                    
-                    function refreshStatus() {{
-                        fetch('/api/status')
-                            .then(response => response.json())
-                            .then(data => updateSystemStatus(data))
-                            .catch(error => console.error('Error:', error));
-                    }}
-                    
-                    // Auto-refresh every 5 seconds
-                    setInterval(refreshStatus, 5000);
-                    
-                    // Initialize
-                    refreshStatus();
-                </script>
+                <script src="{js_url}"></script>
             </body>
             </html>
             """
-    
-    def _setup_routes(self):
-        """Setup Flask routes"""
-        
-        @self.app.route('/')
-        def index():
-            """Main dashboard page"""
-            return self._render_page("System Dashboard", self._get_dashboard_content())
-        
-        @self.app.route('/sessions')
-        def sessions():
-            """Sessions management page"""
-            return self._render_page("Session Management", self._get_sessions_content())
-        
-        @self.app.route('/api/status')
-        def api_status():
-            """Get system status"""
-            try:
-                status = {
-                    'system': {
-                        'running': self.is_running,
-                        'current_task': self.current_task,
-                        'timestamp': datetime.now().isoformat()
-                    },
-                    'resources': {
-                        'cpu_percent': psutil.cpu_percent(interval=0.1),
-                        'memory_percent': psutil.virtual_memory().percent,
-                        'disk_percent': psutil.disk_usage('/').percent,
-                        'processes': len(psutil.pids())
-                    }
-                }
-                
-                return jsonify(status)
-                
-            except Exception as e:
-                return jsonify({'error': str(e)}), 500
-        
-        @self.app.route('/api/health')
-        def api_health():
-            """Health check endpoint"""
-            return jsonify({
-                'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'version': '2.0.0'
-            })
-        
-        @self.app.route('/api/sessions', methods=['GET', 'POST'])
-        def api_sessions():
-            """Manage sessions"""
-            if request.method == 'GET':
-                return jsonify({
-                    'success': True,
-                    'active_sessions': self.active_sessions,
-                    'session_history': self.session_history
-                })
-            
-            elif request.method == 'POST':
-                try:
-                    data = request.get_json()
-                    session_id = f"session_{int(time.time())}"
-                    
-                    # Create new session
-                    session = {
-                        'id': session_id,
-                        'name': data.get('name', 'Untitled Session'),
-                        'task': data.get('task', ''),
-                        'workers': data.get('workers', 4),
-                        'architecture': data.get('architecture', 'HIERARCHICAL'),
-                        'model': data.get('model', 'codellama:7b'),
-                        'project_folder': data.get('project_folder', None),
-                        'status': 'running',
-                        'started_at': datetime.now().isoformat(),
-                        'created_by': 'dashboard'
-                    }
-                    
-                    # Add to active sessions
-                    self.active_sessions[session_id] = session
-                    
-                    # Start session (mock implementation - would integrate with actual framework)
-                    self._start_session_background(session)
-                    
-                    return jsonify({
-                        'success': True,
-                        'session_id': session_id,
-                        'message': 'Session created and started successfully'
-                    })
-                    
-                except Exception as e:
-                    return jsonify({
-                        'success': False,
-                        'error': str(e)
-                    }), 400
-        
-        @self.app.route('/api/sessions/<session_id>')
-        def api_session_details(session_id):
-            """Get session details"""
-            if session_id in self.active_sessions:
-                return jsonify({
-                    'success': True,
-                    'session': self.active_sessions[session_id]
-                })
-            else:
-                # Look in history
-                for session in self.session_history:
-                    if session.get('id') == session_id:
-                        return jsonify({
-                            'success': True,
-                            'session': session
-                        })
-                
-                return jsonify({
-                    'success': False,
-                    'error': 'Session not found'
-                }), 404
-        
-        @self.app.route('/api/sessions/<session_id>/stop', methods=['POST'])
-        def api_stop_session(session_id):
-            """Stop a running session"""
-            if session_id in self.active_sessions:
-                try:
-                    session = self.active_sessions[session_id]
-                    session['status'] = 'stopped'
-                    session['stopped_at'] = datetime.now().isoformat()
-                    
-                    # Calculate duration
-                    if 'started_at' in session:
-                        start_time = datetime.fromisoformat(session['started_at'])
-                        duration = datetime.now() - start_time
-                        session['duration'] = f"{duration.seconds // 60}m {duration.seconds % 60}s"
-                    
-                    # Move to history
-                    self.session_history.append(session.copy())
-                    del self.active_sessions[session_id]
-                    
-                    return jsonify({
-                        'success': True,
-                        'message': 'Session stopped successfully'
-                    })
-                    
-                except Exception as e:
-                    return jsonify({
-                        'success': False,
-                        'error': str(e)
-                    }), 500
-            else:
-                return jsonify({
-                    'success': False,
-                    'error': 'Session not found or already stopped'
-                }), 404
-        
-    def _get_dashboard_content(self):
-            """Get dashboard content"""
-            return """
+    return prefix, suffix
+
+# Static body of the system dashboard page
+_DASHBOARD_CONTENT = """
                     <div class="card">
                         <h2>System Status</h2>
                         <div id="status" class="status">Loading...</div>
@@ -351,69 +158,26 @@ class SimpleDashboard:
                         }
                     </script>
             """
-    
-    def _get_sessions_content(self):
-        """Get sessions management content"""
-        active_sessions_html = ""
-        if self.active_sessions:
-            for session_id, session in self.active_sessions.items():
-                status_class = "running" if session.get('status') == 'running' else "stopped"
-                active_sessions_html += f"""
-                        <div class="session-item {status_class}">
-                            <div class="session-header">
-                                <h4>{session.get('name', session_id)}</h4>
-                                <div>
-                                    <button onclick="stopSession('{session_id}')" class="btn btn-danger btn-sm">Stop</button>
-                                    <button onclick="viewSession('{session_id}')" class="btn btn-secondary btn-sm">View</button>
-                                </div>
-                            </div>
-                            <div class="session-meta">
-                                Status: {session.get('status', 'unknown')} | 
-                                Workers: {session.get('workers', 0)} | 
-                                Architecture: {session.get('architecture', 'unknown')} |
-                                Started: {session.get('started_at', 'unknown')}
-                            </div>
-                            <div style="margin-top: 8px; font-size: 0.9em;">
-                                Task: {session.get('task', 'No description')[:100]}...
-                            </div>
-                        </div>
-                    """
-        else:
-            active_sessions_html = "<p>No active sessions</p>"
-        
-        history_html = ""
-        if self.session_history:
-            for session in self.session_history[-5:]:  # Show last 5
-                history_html += f"""
-                        <div class="session-item stopped">
-                            <div class="session-header">
-                                <h4>{session.get('name', session.get('id', 'Unknown'))}</h4>
-                                <span class="session-meta">Completed</span>
-                            </div>
-                            <div class="session-meta">
-                                Duration: {session.get('duration', 'unknown')} | 
-                                Workers: {session.get('workers', 0)} | 
-                                Architecture: {session.get('architecture', 'unknown')}
-                            </div>
-                        </div>
-                    """
-        else:
-            history_html = "<p>No session history</p>"
-        
-        return f"""
+
+# Static pieces of the sessions page around the dynamic session lists
+_SESSIONS_LAYOUT_HEAD = """
                     <div class="two-column">
                         <div>
                             <div class="card">
                                 <h2>Active Sessions</h2>
                                 <div id="active-sessions">
-                                    {active_sessions_html}
+                                    """
+
+_SESSIONS_LAYOUT_MIDDLE = """
                                 </div>
                             </div>
                             
                             <div class="card">
                                 <h2>Session History</h2>
                                 <div id="session-history">
-                                    {history_html}
+                                    """
+
+_SESSION_FORM_HTML = """
                                 </div>
                             </div>
                         </div>
@@ -473,96 +237,479 @@ class SimpleDashboard:
                                 </form>
                             </div>
                             
-                            <div class="card">
-                                <h2>Session Statistics</h2>
-                                <div class="metric">Total Sessions: <span id="total-sessions">{len(self.session_history)}</span></div>
-                                <div class="metric">Active Sessions: <span id="active-count">{len(self.active_sessions)}</span></div>
-                                <div class="metric">Avg Duration: <span id="avg-duration">-</span></div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <script>
-                        function createSession(event) {{
+"""
+
+_SESSIONS_JS = """                    <script>
+                        function createSession(event) {
                             event.preventDefault();
                             
                             const formData = new FormData(event.target);
-                            const sessionData = {{
+                            const sessionData = {
                                 name: formData.get('name'),
                                 task: formData.get('task'),
                                 workers: parseInt(formData.get('workers')),
                                 architecture: formData.get('architecture'),
                                 model: formData.get('model'),
                                 project_folder: formData.get('project_folder') || null
-                            }};
+                            };
                             
-                            fetch('/api/sessions', {{
+                            fetch('/api/sessions', {
                                 method: 'POST',
-                                headers: {{
+                                headers: {
                                     'Content-Type': 'application/json',
-                                }},
+                                },
                                 body: JSON.stringify(sessionData)
-                            }})
+                            })
                             .then(response => response.json())
-                            .then(data => {{
-                                if (data.success) {{
+                            .then(data => {
+                                if (data.success) {
                                     alert('Session created successfully!');
                                     location.reload();
-                                }} else {{
+                                } else {
                                     alert('Error creating session: ' + data.error);
-                                }}
-                            }})
-                            .catch(error => {{
+                                }
+                            })
+                            .catch(error => {
                                 console.error('Error:', error);
                                 alert('Error creating session');
-                            }});
-                        }}
+                            });
+                        }
                         
-                        function stopSession(sessionId) {{
-                            if (confirm('Are you sure you want to stop this session?')) {{
-                                fetch(`/api/sessions/${{sessionId}}/stop`, {{
+                        function stopSession(sessionId) {
+                            if (confirm('Are you sure you want to stop this session?')) {
+                                fetch(`/api/sessions/${sessionId}/stop`, {
                                     method: 'POST'
-                                }})
+                                })
                                 .then(response => response.json())
-                                .then(data => {{
-                                    if (data.success) {{
+                                .then(data => {
+                                    if (data.success) {
                                         location.reload();
-                                    }} else {{
+                                    } else {
                                         alert('Error stopping session: ' + data.error);
-                                    }}
-                                }})
-                                .catch(error => {{
+                                    }
+                                })
+                                .catch(error => {
                                     console.error('Error:', error);
                                     alert('Error stopping session');
-                                }});
-                            }}
-                        }}
+                                });
+                            }
+                        }
                         
-                        function viewSession(sessionId) {{
-                            fetch(`/api/sessions/${{sessionId}}`)
+                        function viewSession(sessionId) {
+                            fetch(`/api/sessions/${sessionId}`)
                                 .then(response => response.json())
-                                .then(data => {{
-                                    if (data.success) {{
+                                .then(data => {
+                                    if (data.success) {
                                         const session = data.session;
-                                        alert(`Session Details:\\n\\nName: ${{session.name}}\\nStatus: ${{session.status}}\\nWorkers: ${{session.workers}}\\nArchitecture: ${{session.architecture}}\\nTask: ${{session.task}}`);
-                                    }} else {{
+                                        alert(`Session Details:\\n\\nName: ${session.name}\\nStatus: ${session.status}\\nWorkers: ${session.workers}\\nArchitecture: ${session.architecture}\\nTask: ${session.task}`);
+                                    } else {
                                         alert('Error loading session details');
-                                    }}
-                                }})
-                                .catch(error => {{
+                                    }
+                                })
+                                .catch(error => {
                                     console.error('Error:', error);
                                     alert('Error loading session details');
-                                }});
-                        }}
+                                });
+                        }
                         
                         // Auto-refresh sessions every 10 seconds
-                        setInterval(() => {{
-                            if (window.location.pathname === '/sessions') {{
+                        setInterval(() => {
+                            if (window.location.pathname === '/sessions') {
                                 location.reload();
-                            }}
-                        }}, 10000);
+                            }
+                        }, 10000);
                     </script>
             """
+
+def _public_session(session):
+    """Return a session without its internal underscore-prefixed fields"""
+    return {key: value for key, value in session.items() if not key.startswith('_')}
+
+def _slim_session(session, fields):
+    """Project a session onto the given list-view fields"""
+    return {key: session.get(key) for key in fields}
+
+def _session_elapsed_seconds(session):
+    """Seconds since the session started, or None if its start is unknown"""
+    started_mono = session.get('_started_mono')
+    if started_mono is not None:
+        return int(time.monotonic() - started_mono)
+    
+    # Sessions created outside api_sessions only carry the ISO timestamp
+    if 'started_at' in session:
+        return (datetime.now() - datetime.fromisoformat(session['started_at'])).seconds
+    return None
+
+def _format_duration(seconds):
+    """Format a duration in seconds as 'Xm Ys'"""
+    return f"{seconds // 60}m {seconds % 60}s"
+
+# Session entry markup, parsed once at import; values are escaped before substitution
+_ACTIVE_SESSION_TPL = Template("""
+                        <div class="session-item $status_class">
+                            <div class="session-header">
+                                <h4>$name</h4>
+                                <div>
+                                    <button onclick="stopSession($js_session_id)" class="btn btn-danger btn-sm">Stop</button>
+                                    <button onclick="viewSession($js_session_id)" class="btn btn-secondary btn-sm">View</button>
+                                </div>
+                            </div>
+                            <div class="session-meta">
+                                Status: $status | 
+                                Workers: $workers | 
+                                Architecture: $architecture |
+                                Started: $started_at
+                            </div>
+                            <div style="margin-top: 8px; font-size: 0.9em;">
+                                Task: $task...
+                            </div>
+                        </div>
+                    """)
+
+_HISTORY_SESSION_TPL = Template("""
+                        <div class="session-item stopped">
+                            <div class="session-header">
+                                <h4>$name</h4>
+                                <span class="session-meta">Completed</span>
+                            </div>
+                            <div class="session-meta">
+                                Duration: $duration | 
+                                Workers: $workers | 
+                                Architecture: $architecture
+                            </div>
+                        </div>
+                    """)
+
+def _render_active_session(session_id, session):
+    """Render one active session entry"""
+    return _ACTIVE_SESSION_TPL.substitute(
+        status_class="running" if session.get('status') == 'running' else "stopped",
+        js_session_id=escape(json.dumps(session_id)),
+        name=escape(session.get('name', session_id)),
+        status=escape(session.get('status', 'unknown')),
+        workers=escape(session.get('workers', 0)),
+        architecture=escape(session.get('architecture', 'unknown')),
+        started_at=escape(session.get('started_at', 'unknown')),
+        task=escape(session.get('task', 'No description')[:100])
+    )
+
+def _render_history_session(session):
+    """Render one session history entry"""
+    return _HISTORY_SESSION_TPL.substitute(
+        name=escape(session.get('name', session.get('id', 'Unknown'))),
+        duration=escape(session.get('duration', 'unknown')),
+        workers=escape(session.get('workers', 0)),
+        architecture=escape(session.get('architecture', 'unknown'))
+    )
+
+class SimpleDashboard:
+    """Simple Flask web dashboard for Ollama Flow Framework"""
+    
+    def __init__(self, host='localhost', port=5000, debug=False, history_limit=SESSION_HISTORY_LIMIT):
+        """Initialize simple dashboard"""
+        self.host = host
+        self.port = port
+        self.debug = debug
+        
+        # Flask app setup
+        self.app = Flask(__name__)
+        self.app.config['SECRET_KEY'] = 'ollama-flow-dashboard-secret'
+        self.app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE
+        
+        # Compress the CSS/JS-heavy pages; tiny JSON replies are not worth it
+        if HAS_COMPRESS:
+            self.app.config['COMPRESS_MIN_SIZE'] = 500
+            self.app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+            Compress(self.app)
+        
+        # Setup SocketIO if available
+        if HAS_SOCKETIO:
+            self.socketio = SocketIO(self.app, cors_allowed_origins="*",
+                                     async_mode=SOCKETIO_ASYNC_MODE, **socketio_json_options())
+        else:
+            self.socketio = None
+        
+        # Dashboard state
+        self.is_running = False
+        self.current_task = None
+        self.task_history = []
+        self.system_metrics = {}
+        self.update_task = None
+        
+        prime_cpu_percent()
+        
+        # Session management. active_sessions is copy-on-write: writers swap in a
+        # new dict under _sessions_lock, readers use the current reference as is
+        self.active_sessions = {}
+        self._sessions_lock = threading.Lock()
+        self.session_history = deque(maxlen=history_limit)
+        
+        # Event loop thread for session runs and the update task, started on first use
+        self._background_loop = None
+        self._background_loop_lock = threading.Lock()
+        
+        # Running totals of finished session durations for the average
+        self._duration_lock = threading.Lock()
+        self._duration_total = 0
+        self._duration_count = 0
+        
+        # Prebuilt page layouts keyed by title
+        self._shell_cache = {title: _build_page_shell(title, self.app.static_url_path)
+                             for title in (DASHBOARD_TITLE, SESSIONS_TITLE)}
+        
+        # Setup routes
+        self._setup_routes()
+        
+        # Setup SocketIO events if available
+        if HAS_SOCKETIO:
+            self._setup_socketio_events()
+    
+    def _render_page(self, title, content):
+        """Render a page with common layout"""
+        shell = self._shell_cache.get(title)
+        if shell is None:
+            shell = self._shell_cache[title] = _build_page_shell(title, self.app.static_url_path)
+        prefix, suffix = shell
+        return prefix + content + suffix
+    
+    def _setup_routes(self):
+        """Setup Flask routes"""
+        
+        @self.app.route('/')
+        def index():
+            """Main dashboard page"""
+            return self._render_page(DASHBOARD_TITLE, self._get_dashboard_content())
+        
+        @self.app.route('/sessions')
+        def sessions():
+            """Sessions management page"""
+            return self._render_page(SESSIONS_TITLE, self._get_sessions_content())
+        
+        @self.app.route('/api/status')
+        def api_status():
+            """Get system status"""
+            try:
+                status = {
+                    'system': {
+                        'running': self.is_running,
+                        'current_task': self.current_task,
+                        'timestamp': datetime.now().isoformat()
+                    },
+                    'resources': self.system_metrics or self._sample_system_metrics()
+                }
+                
+                return ojsonify(status)
+                
+            except Exception as e:
+                return ojsonify({'error': str(e)}, 500)
+        
+        @self.app.route('/api/stats')
+        def api_stats():
+            """Get session statistics"""
+            avg_seconds = self._avg_duration_seconds()
+            return ojsonify({
+                'total_sessions': len(self.session_history),
+                'active_sessions': len(self.active_sessions),
+                'avg_duration_seconds': avg_seconds,
+                'avg_duration': _format_duration(avg_seconds) if avg_seconds is not None else None
+            })
+        
+        @self.app.route('/api/health')
+        def api_health():
+            """Health check endpoint"""
+            return ojsonify({
+                'status': 'healthy',
+                'timestamp': datetime.now().isoformat(),
+                'version': '2.0.0'
+            })
+        
+        @self.app.route('/api/sessions', methods=['GET', 'POST'])
+        def api_sessions():
+            """Manage sessions"""
+            if request.method == 'GET':
+                return ojsonify({
+                    'success': True,
+                    'active_sessions': {session_id: _slim_session(session, SESSION_LIST_FIELDS)
+                                        for session_id, session in self.active_sessions.items()},
+                    'session_history': [_slim_session(session, SESSION_HISTORY_FIELDS) for session in
+                                        self._recent_history(SESSION_HISTORY_API_LIMIT)]
+                })
+            
+            elif request.method == 'POST':
+                try:
+                    data = request.get_json()
+                    session_id = f"session_{int(time.time())}"
+                    
+                    # Create new session
+                    session = {
+                        'id': session_id,
+                        'name': data.get('name', 'Untitled Session'),
+                        'task': data.get('task', ''),
+                        'workers': data.get('workers', 4),
+                        'architecture': data.get('architecture', 'HIERARCHICAL'),
+                        'model': data.get('model', 'codellama:7b'),
+                        'project_folder': data.get('project_folder', None),
+                        'status': 'running',
+                        'started_at': datetime.now().isoformat(),
+                        'created_by': 'dashboard',
+                        '_started_mono': time.monotonic()
+                    }
+                    
+                    # Add to active sessions
+                    self._add_active_session(session_id, session)
+                    
+                    # Start session (mock implementation - would integrate with actual framework)
+                    self._start_session_background(session)
+                    
+                    return ojsonify({
+                        'success': True,
+                        'session_id': session_id,
+                        'message': 'Session created and started successfully'
+                    })
+                    
+                except Exception as e:
+                    return ojsonify({
+                        'success': False,
+                        'error': str(e)
+                    }, 400)
+        
+        @self.app.route('/api/sessions/<session_id>')
+        def api_session_details(session_id):
+            """Get session details"""
+            session = self.active_sessions.get(session_id)
+            if session is not None:
+                return ojsonify({
+                    'success': True,
+                    'session': _public_session(session)
+                })
+            else:
+                # Look in history; snapshot it, the loop thread appends concurrently
+                for session in tuple(self.session_history):
+                    if session.get('id') == session_id:
+                        return ojsonify({
+                            'success': True,
+                            'session': _public_session(session)
+                        })
+                
+                return ojsonify({
+                    'success': False,
+                    'error': 'Session not found'
+                }, 404)
+        
+        @self.app.route('/api/sessions/<session_id>/stop', methods=['POST'])
+        def api_stop_session(session_id):
+            """Stop a running session"""
+            session = self._pop_active_session(session_id, stopped=True)
+            if session is not None:
+                try:
+                    session['status'] = 'stopped'
+                    session['stopped_at'] = datetime.now().isoformat()
+                    
+                    # Calculate duration
+                    elapsed = _session_elapsed_seconds(session)
+                    if elapsed is not None:
+                        session['duration'] = _format_duration(elapsed)
+                        self._record_session_duration(elapsed)
+                    
+                    # Move to history; the popped dict is no longer shared, so no copy
+                    self.session_history.append(session)
+                    
+                    return ojsonify({
+                        'success': True,
+                        'message': 'Session stopped successfully'
+                    })
+                    
+                except Exception as e:
+                    return ojsonify({
+                        'success': False,
+                        'error': str(e)
+                    }, 500)
+            else:
+                return ojsonify({
+                    'success': False,
+                    'error': 'Session not found or already stopped'
+                }, 404)
+        
+    def _get_dashboard_content(self):
+        """Get dashboard content"""
+        return _DASHBOARD_CONTENT
+    
+    def _add_active_session(self, session_id, session):
+        """Publish a new active_sessions dict that includes session"""
+        with self._sessions_lock:
+            sessions = dict(self.active_sessions)
+            sessions[session_id] = session
+            self.active_sessions = sessions
+    
+    def _pop_active_session(self, session_id, stopped=False):
+        """Publish a new active_sessions dict without session_id and return its session, or None
+        
+        With stopped=True the session is flagged '_stopped' under the same lock,
+        so run_session can tell a stop from a session that was never active.
+        """
+        with self._sessions_lock:
+            if session_id not in self.active_sessions:
+                return None
+            sessions = dict(self.active_sessions)
+            session = sessions.pop(session_id)
+            if stopped:
+                session['_stopped'] = True
+            self.active_sessions = sessions
+            return session
+    
+    def _record_session_duration(self, seconds):
+        """Add a finished session's duration to the running average"""
+        with self._duration_lock:
+            self._duration_total += seconds
+            self._duration_count += 1
+    
+    def _avg_duration_seconds(self):
+        """Average finished-session duration in whole seconds, or None if none finished"""
+        total, count = self._duration_total, self._duration_count
+        return total // count if count else None
+    
+    def _avg_duration_display(self):
+        """Average session duration formatted for the statistics card"""
+        avg_seconds = self._avg_duration_seconds()
+        return _format_duration(avg_seconds) if avg_seconds is not None else '-'
+    
+    def _recent_history(self, count):
+        """Return the last count finished sessions, oldest first"""
+        # tuple() copies the deque atomically; iterating it live can raise
+        # "deque mutated during iteration" while the loop thread appends
+        history = tuple(self.session_history)
+        return list(history[-count:]) if count > 0 else []
+    
+    def _get_sessions_content(self):
+        """Get sessions management content"""
+        # str.join over a list sizes the result once instead of re-copying per entry
+        active_sessions = self.active_sessions
+        active_sessions_html = "".join([
+            _render_active_session(session_id, session)
+            for session_id, session in active_sessions.items()
+        ]) or "<p>No active sessions</p>"
+        
+        # Show last 5
+        history_html = "".join([
+            _render_history_session(session) for session in self._recent_history(5)
+        ]) or "<p>No session history</p>"
+        
+        stats_html = f"""                            <div class="card">
+                                <h2>Session Statistics</h2>
+                                <div class="metric">Total Sessions: <span id="total-sessions">{len(self.session_history)}</span></div>
+                                <div class="metric">Active Sessions: <span id="active-count">{len(active_sessions)}</span></div>
+                                <div class="metric">Avg Duration: <span id="avg-duration">{self._avg_duration_display()}</span></div>
+                            </div>
+                        </div>
+                    </div>
+                    
+"""
+        
+        return "".join((
+            _SESSIONS_LAYOUT_HEAD, active_sessions_html,
+            _SESSIONS_LAYOUT_MIDDLE, history_html,
+            _SESSION_FORM_HTML, stats_html, _SESSIONS_JS
+        ))
     
     def _setup_socketio_events(self):
         """Setup SocketIO events for real-time updates"""
@@ -580,30 +727,55 @@ class SimpleDashboard:
             """Handle client disconnection"""
             logger.info("Client disconnected from dashboard")
     
+    def _sample_system_metrics(self):
+        """Sample system resources without blocking"""
+        return {
+            'cpu_percent': psutil.cpu_percent(interval=None),
+            'memory_percent': psutil.virtual_memory().percent,
+            'disk_percent': psutil.disk_usage('/').percent,
+            'processes': len(psutil.pids()),
+            'timestamp': datetime.now().isoformat()
+        }
+    
     def _emit_system_update(self):
-        """Emit system status update via SocketIO"""
-        if not HAS_SOCKETIO or not self.socketio:
-            return
-            
+        """Sample system metrics and broadcast a system status update"""
         try:
-            status = {
+            # Cache the sample for /api/status, which has no loop of its own
+            self.system_metrics = self._sample_system_metrics()
+            if not HAS_SOCKETIO or not self.socketio:
+                return
+            
+            # One combined payload per tick, so clients get a single frame for
+            # status, resources and sessions
+            active_sessions = self.active_sessions
+            self.socketio.emit('system_update', {
                 'system': {
                     'running': self.is_running,
                     'timestamp': datetime.now().isoformat()
                 },
-                'resources': {
-                    'cpu_percent': psutil.cpu_percent(interval=0.1),
-                    'memory_percent': psutil.virtual_memory().percent,
-                    'disk_percent': psutil.disk_usage('/').percent
+                'resources': self.system_metrics,
+                'sessions': {
+                    'active': [_slim_session(session, SESSION_LIST_FIELDS)
+                               for session in active_sessions.values()],
+                    'total': len(self.session_history),
+                    'avg_duration': self._avg_duration_display()
                 }
-            }
-            self.socketio.emit('system_update', status)
+            })
         except Exception as e:
             logger.error(f"Failed to emit system update: {e}")
     
+    def _get_background_loop(self):
+        """Return the background event loop, starting its thread on first use"""
+        with self._background_loop_lock:
+            if self._background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                self._background_loop = loop
+        return self._background_loop
+    
     def _start_session_background(self, session):
-        """Start session execution in background thread"""
-        def run_session():
+        """Schedule session execution on the shared session event loop"""
+        async def run_session():
             try:
                 session_id = session['id']
                 logger.info(f"Starting session {session_id}: {session['name']}")
@@ -613,74 +785,88 @@ class SimpleDashboard:
                 # 2. Create OllamaFlowFramework instance
                 # 3. Run the task with specified parameters
                 
-                # Simulate work for demo
-                import subprocess
-                import shlex
-                
-                cmd_parts = [
+                cmd_parts = (
                     'python3', 'enhanced_main.py',
                     '--task', session['task'],
                     '--workers', str(session['workers']),
                     '--arch', session['architecture'],
                     '--model', session['model']
-                ]
+                )
                 
                 if session.get('project_folder'):
-                    cmd_parts.extend(['--project-folder', session['project_folder']])
+                    cmd_parts += ('--project-folder', session['project_folder'])
                 
-                # Update session status
+                # Update session status unless it was stopped before starting
+                if session.get('_stopped'):
+                    return
                 session['status'] = 'executing'
                 session['command'] = ' '.join(cmd_parts)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Session {session_id} command: {shlex.join(cmd_parts)}")
                 
-                # In a real implementation, this would execute the command
+                # In a real implementation, this would execute the command with
+                # await asyncio.create_subprocess_exec(*cmd_parts) and await proc.wait()
                 # For now, we'll simulate completion after a short delay
-                time.sleep(2)
+                await asyncio.sleep(2)
+                
+                # Claim the session; if a stop request popped it first, that
+                # route already recorded it and moved it to history
+                if self._pop_active_session(session_id) is None:
+                    return
                 
                 # Simulate completion
                 session['status'] = 'completed'
                 session['completed_at'] = datetime.now().isoformat()
                 
                 # Calculate duration
-                if 'started_at' in session:
-                    start_time = datetime.fromisoformat(session['started_at'])
-                    duration = datetime.now() - start_time
-                    session['duration'] = f"{duration.seconds // 60}m {duration.seconds % 60}s"
+                elapsed = _session_elapsed_seconds(session)
+                if elapsed is not None:
+                    session['duration'] = _format_duration(elapsed)
+                    self._record_session_duration(elapsed)
                 
                 # Move to history
-                self.session_history.append(session.copy())
-                if session_id in self.active_sessions:
-                    del self.active_sessions[session_id]
+                self.session_history.append(session)
                 
                 logger.info(f"Session {session_id} completed successfully")
                 
             except Exception as e:
                 logger.error(f"Session {session_id} failed: {e}")
+                
+                # A stop request already moved the session to history
+                if self._pop_active_session(session_id) is None and session.get('_stopped'):
+                    return
+                
                 session['status'] = 'failed'
                 session['error'] = str(e)
                 session['failed_at'] = datetime.now().isoformat()
                 
                 # Move to history even if failed
-                self.session_history.append(session.copy())
-                if session_id in self.active_sessions:
-                    del self.active_sessions[session_id]
+                self.session_history.append(session)
         
-        # Start session in background thread
-        session_thread = threading.Thread(target=run_session, daemon=True)
-        session_thread.start()
+        # Sessions share one event loop thread instead of a thread each
+        asyncio.run_coroutine_threadsafe(run_session(), self._get_background_loop())
+    
+    async def _update_loop(self):
+        """Sample and emit a system update every SYSTEM_UPDATE_INTERVAL on absolute deadlines"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            try:
+                self._emit_system_update()
+            except Exception as e:
+                logger.error(f"Update loop error: {e}")
+            
+            # Advance from the previous deadline so emit time doesn't accumulate as drift
+            deadline += SYSTEM_UPDATE_INTERVAL
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
     
     def start_update_thread(self):
-        """Start background thread for periodic updates"""
-        def update_loop():
-            while True:
-                try:
-                    self._emit_system_update()
-                    time.sleep(5)  # Update every 5 seconds
-                except Exception as e:
-                    logger.error(f"Update loop error: {e}")
-                    time.sleep(5)
-        
-        self.update_thread = threading.Thread(target=update_loop, daemon=True)
-        self.update_thread.start()
+        """Start the periodic update task on the background event loop"""
+        self.update_task = asyncio.run_coroutine_threadsafe(self._update_loop(), self._get_background_loop())
+    
+    def start_background_threads(self):
+        """Start the background update task (also used by the WSGI entrypoint)"""
+        self.start_update_thread()
     
     def run(self):
         """Run the simple dashboard"""
@@ -703,8 +889,7 @@ Press Ctrl+C to stop
 ========================================
             """)
         
-        # Start update thread
-        self.start_update_thread()
+        self.start_background_threads()
         
         # Run Flask app
         if HAS_SOCKETIO and self.socketio:
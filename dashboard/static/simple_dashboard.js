@@ -0,0 +1,44 @@
+// Common JavaScript functions
+const socket = typeof io !== 'undefined' ? io() : null;
+
+if (socket) {
+    socket.on('connect', function() {
+        console.log('Connected to dashboard');
+    });
+    
+    socket.on('system_update', function(data) {
+        updateSystemStatus(data);
+    });
+}
+
+function updateSystemStatus(data) {
+    if (data.system && document.getElementById('status')) {
+        document.getElementById('status').textContent = data.system.running ? 'Running' : 'Stopped';
+        if (document.getElementById('timestamp')) {
+            document.getElementById('timestamp').textContent = 'Last updated: ' + data.system.timestamp;
+        }
+    }
+    if (data.resources) {
+        if (document.getElementById('cpu')) document.getElementById('cpu').textContent = data.resources.cpu_percent.toFixed(1);
+        if (document.getElementById('memory')) document.getElementById('memory').textContent = data.resources.memory_percent.toFixed(1);
+        if (document.getElementById('disk')) document.getElementById('disk').textContent = data.resources.disk_percent.toFixed(1);
+    }
+    if (data.sessions) {
+        if (document.getElementById('active-count')) document.getElementById('active-count').textContent = data.sessions.active.length;
+        if (document.getElementById('total-sessions')) document.getElementById('total-sessions').textContent = data.sessions.total;
+        if (document.getElementById('avg-duration')) document.getElementById('avg-duration').textContent = data.sessions.avg_duration;
+    }
+}
+
+function refreshStatus() {
+    fetch('/api/status')
+        .then(response => response.json())
+        .then(data => updateSystemStatus(data))
+        .catch(error => console.error('Error:', error));
+}
+
+// Poll only when SocketIO push updates are unavailable
+if (!socket) setInterval(refreshStatus, 5000);
+
+// Initialize
+refreshStatus();
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+WSGI entrypoint for the Simple Ollama Flow Dashboard
+
+Serve with Gunicorn and a gevent WebSocket worker instead of the Werkzeug
+development server, so requests and SocketIO clients don't block each other:
+
+    gunicorn --chdir dashboard -k geventwebsocket.gunicorn.workers.GeventWebSocketWorker \\
+        -w 1 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:application
+
+Keep a single worker: sessions and metrics live in process memory.
+For local development, `python3 dashboard/simple_dashboard.py` still works.
+"""
+
+import os
+import sys
+
+# The repository root has a dashboard.py module that shadows this package,
+# so import simple_dashboard from this directory directly
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# The gevent worker has already monkey-patched the stdlib; serve SocketIO on
+# greenlets so each WebSocket doesn't hold an OS thread
+os.environ.setdefault('OLLAMA_DASHBOARD_ASYNC_MODE', 'gevent')
+
+from simple_dashboard import SimpleDashboard
+
+dashboard = SimpleDashboard(
+    host=os.environ.get('OLLAMA_DASHBOARD_HOST', '0.0.0.0'),
+    port=int(os.environ.get('OLLAMA_DASHBOARD_PORT', '5000'))
+)
+dashboard.start_background_threads()
+
+application = dashboard.app
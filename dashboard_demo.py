@@ -6,23 +6,60 @@ Creates a static representation of what the dashboard looks like
 
 import os
 import sys
+import time
 import psutil
 from datetime import datetime
+from functools import lru_cache
+
+# Snapshots are reused within this window so fast redraws don't re-read /proc
+METRICS_TTL_SECONDS = 1.0
+
+# Terminal colors
+HEADER = '\033[95m'
+BLUE = '\033[94m'
+CYAN = '\033[96m'
+GREEN = '\033[92m'
+YELLOW = '\033[93m'
+RED = '\033[91m'
+BOLD = '\033[1m'
+UNDERLINE = '\033[4m'
+END = '\033[0m'
+
+# The demo samples once right after starting, so CPU load is measured over a
+# short blocking interval; a non-blocking read would have nothing to compare to
+CPU_SAMPLE_SECONDS = 0.1
+
+@lru_cache(maxsize=1)
+def _metrics_snapshot(tick):
+    """Sample all system metrics in one pass; tick is the TTL window key"""
+    return {
+        'cpu': psutil.cpu_percent(interval=CPU_SAMPLE_SECONDS),
+        'mem': psutil.virtual_memory().percent,
+        'disk': psutil.disk_usage('/').percent,
+        'procs': len(psutil.pids())
+    }
+
+@lru_cache(maxsize=None)
+def _progress_bars(width):
+    """All width+1 fill levels of a progress bar, built once per width"""
+    return tuple("█" * filled + "░" * (width - filled) for filled in range(width + 1))
+
+# Bar color by 10% bucket: green below 50%, yellow below 80%, red above
+_COLOR_BY_BUCKET = (GREEN,) * 5 + (YELLOW,) * 3 + (RED,) * 3
+
+def _render_bar(percentage, width=30):
+    """Format 'NN.N% [bar]' with the bar colored by load, from prebuilt tables"""
+    color = _COLOR_BY_BUCKET[min(max(int(percentage) // 10, 0), 10)]
+    filled = min(max(int(percentage * width / 100), 0), width)
+    return f"{percentage:5.1f}% {color}[{_progress_bars(width)[filled]}]{END}"
+
+def sample_metrics():
+    """Return the system metrics snapshot for the current TTL window"""
+    return _metrics_snapshot(int(time.monotonic() / METRICS_TTL_SECONDS))
 
 def print_dashboard_demo():
     """Print a demo of what the CLI dashboard looks like"""
     
-    # Terminal colors
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    CYAN = '\033[96m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
-    END = '\033[0m'
-    
     # Clear screen
     os.system('clear' if os.name == 'posix' else 'cls')
     
@@ -43,8 +80,9 @@ def print_dashboard_demo():
     print()
     
     # Get real system metrics
-    cpu_percent = psutil.cpu_percent()
-    memory_percent = psutil.virtual_memory().percent
+    snap = sample_metrics()
+    cpu_percent = snap['cpu']
+    memory_percent = snap['mem']
     
     # Quick stats in columns
     stats_left = [
@@ -105,35 +143,12 @@ def print_dashboard_demo():
     print(BLUE + BOLD + "💻 SYSTEM RESOURCES" + END)
     print()
     
-    # Create progress bars
-    def create_progress_bar(percentage, width=40):
-        filled = int(percentage * width / 100)
-        bar = "█" * filled + "░" * (width - filled)
-        return bar
-    
-    def get_color(percentage):
-        if percentage < 50:
-            return GREEN
-        elif percentage < 80:
-            return YELLOW
-        else:
-            return RED
-    
-    cpu_bar = create_progress_bar(cpu_percent, 30)
-    cpu_color = get_color(cpu_percent)
-    print(f"  CPU Usage: {cpu_percent:5.1f}% {cpu_color}[{cpu_bar}]{END}")
-    
-    mem_bar = create_progress_bar(memory_percent, 30)
-    mem_color = get_color(memory_percent)
-    print(f"  Memory:    {memory_percent:5.1f}% {mem_color}[{mem_bar}]{END}")
-    
-    disk_percent = psutil.disk_usage('/').percent
-    disk_bar = create_progress_bar(disk_percent, 30)
-    disk_color = get_color(disk_percent)
-    print(f"  Disk:      {disk_percent:5.1f}% {disk_color}[{disk_bar}]{END}")
+    print(f"  CPU Usage: {_render_bar(cpu_percent)}")
+    print(f"  Memory:    {_render_bar(memory_percent)}")
+    print(f"  Disk:      {_render_bar(snap['disk'])}")
     
     print()
-    print(f"  {CYAN}Active Processes: {len(psutil.pids())}{END}")
+    print(f"  {CYAN}Active Processes: {snap['procs']}{END}")
     print(f"  {CYAN}Ollama Processes: 2{END}")
     
     print()
@@ -155,8 +170,10 @@ def print_dashboard_demo():
     
     max_key_length = max(len(key) for key, _ in config_items)
     
+    # Build the row format once rather than a nested-width f-string per row
+    format_config_row = f"  {BLUE}{{:>{max_key_length}}}: {END}{{}}".format
     for key, value in config_items:
-        print(f"  {BLUE}{key:>{max_key_length}}: {END}{value}")
+        print(format_config_row(key, value))
     
     print()
     print(f"  {BLUE}Features:{END}")
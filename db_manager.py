@@ -1,20 +1,94 @@
 import sqlite3
 import asyncio
+import functools
 import json
-from typing import List, Dict, Any
+import threading
+from typing import List, Optional
+
+# Column order of the messages table, shared by SELECTs and Message
+MESSAGE_COLUMNS = ('id', 'sender_id', 'receiver_id', 'type', 'content', 'request_id', 'timestamp', 'status')
+
+# Hot-path statements, kept as constants so sqlite3's statement cache reuses them
+INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (sender_id, receiver_id, type, content, request_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+SELECT_PENDING_SQL = f"""
+    SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages
+    WHERE receiver_id = ? AND status = 'pending'
+    ORDER BY timestamp ASC
+"""
+MARK_PROCESSED_SQL = "UPDATE messages SET status = 'processed' WHERE id = ?"
+DELETE_PROCESSED_BATCH_SQL = """
+    DELETE FROM messages
+    WHERE id IN (SELECT id FROM messages WHERE status = 'processed' LIMIT ?)
+"""
+
+# Processed rows are purged once this many accumulate, in batches of
+# PROCESSED_GC_BATCH so each write transaction stays short
+PROCESSED_GC_THRESHOLD = 1000
+PROCESSED_GC_BATCH = 500
+
+# Above this many rows a full clear drops and recreates the table instead of
+# deleting (and WAL-logging) every row
+CLEAR_DROP_THRESHOLD = 1000
+
+SELECT_ALL_SQL = f"SELECT {', '.join(MESSAGE_COLUMNS)} FROM messages ORDER BY timestamp ASC"
+
+class Message:
+    """One messages row, subscriptable by column name like the dicts it replaces"""
+    __slots__ = MESSAGE_COLUMNS
+
+    def __init__(self, id, sender_id, receiver_id, type, content, request_id, timestamp, status):
+        self.id = id
+        self.sender_id = sender_id
+        self.receiver_id = receiver_id
+        self.type = type
+        self.content = content
+        self.request_id = request_id
+        self.timestamp = timestamp
+        self.status = status
+
+    def __getitem__(self, key: str):
+        if key not in MESSAGE_COLUMNS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __repr__(self):
+        fields = ', '.join(f"{column}={getattr(self, column)!r}" for column in MESSAGE_COLUMNS)
+        return f"Message({fields})"
+
+def _serialized(method):
+    """Run a MessageDBManager method under the instance's connection lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
 
 class MessageDBManager:
+    # Fixed attribute layout: no per-instance __dict__ and faster attribute access
+    __slots__ = ('db_path', 'conn', '_processed_since_gc', '_lock')
+
     def __init__(self, db_path: str = 'messages.db'):
-        self.db_path = db_path
-        self.conn = None
+        self.db_path: str = db_path
+        self.conn: Optional[sqlite3.Connection] = None
+        self._processed_since_gc: int = 0
+        # The connection is shared with executor threads used by the *_async methods
+        self._lock = threading.RLock()
         self.connect()
         self.create_table()
 
     def connect(self):
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
-            self.conn.row_factory = sqlite3.Row
-
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            # WAL with synchronous=NORMAL avoids an fsync on every commit
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-65536")
+
+    @_serialized
     def close(self):
         if self.conn:
             self.conn.close()
@@ -34,85 +108,118 @@ class MessageDBManager:
                 status TEXT DEFAULT 'pending'
             )
         """)
+        # Pending-message polls become an index range scan already in timestamp order
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending ON messages(receiver_id, status, timestamp)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON messages(status)")
         self.conn.commit()
 
+    @_serialized
     def clear_all_messages(self):
         """Clear all messages from the database on startup for a fresh start"""
         if self.conn is None:
             self.connect()
         
         cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM messages")
-        self.conn.commit()
+        row_count = cursor.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        if row_count > CLEAR_DROP_THRESHOLD:
+            # Dropping also removes the table's auto-increment counter
+            cursor.execute("DROP TABLE messages")
+            self.conn.commit()
+            self.create_table()
+        else:
+            cursor.execute("DELETE FROM messages")
+            self.conn.commit()
+            
+            # Reset auto-increment counter
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name='messages'")
+            self.conn.commit()
         
-        # Reset auto-increment counter
-        cursor.execute("DELETE FROM sqlite_sequence WHERE name='messages'")
-        self.conn.commit()
+        self._processed_since_gc = 0
         
         print("✅ Database cleared - Fresh start for ollama-flow")
 
+    @_serialized
     def insert_message(self, sender_id: str, receiver_id: str, type: str, content: str, request_id: str = None) -> int:
         # Ensure connection is active
         if self.conn is None:
             self.connect()
         
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO messages (sender_id, receiver_id, type, content, request_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (sender_id, receiver_id, type, content, request_id)
-        )
+        cursor = self.conn.execute(INSERT_MESSAGE_SQL, (sender_id, receiver_id, type, content, request_id))
         self.conn.commit()
         return cursor.lastrowid
 
-    def get_pending_messages(self, receiver_id: str) -> List[Dict[str, Any]]:
+    @_serialized
+    def insert_messages(self, messages: List[tuple]) -> int:
+        """Insert (sender_id, receiver_id, type, content, request_id) tuples in one transaction"""
         # Ensure connection is active
         if self.conn is None:
             self.connect()
         
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT * FROM messages
-            WHERE receiver_id = ? AND status = 'pending'
-            ORDER BY timestamp ASC
-            """,
-            (receiver_id,)
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        cursor = self.conn.executemany(INSERT_MESSAGE_SQL, messages)
+        self.conn.commit()
+        return cursor.rowcount
 
+    @_serialized
+    def get_pending_messages(self, receiver_id: str) -> List[Message]:
+        # Ensure connection is active
+        if self.conn is None:
+            self.connect()
+        
+        rows = self.conn.execute(SELECT_PENDING_SQL, (receiver_id,)).fetchall()
+        return [Message(*row) for row in rows]
+
+    @_serialized
     def mark_message_as_processed(self, message_id: int):
         # Ensure connection is active
         if self.conn is None:
             self.connect()
         
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            UPDATE messages
-            SET status = 'processed'
-            WHERE id = ?
-            """,
-            (message_id,)
-        )
+        self.conn.execute(MARK_PROCESSED_SQL, (message_id,))
         self.conn.commit()
 
-    def delete_processed_messages(self):
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            DELETE FROM messages
-            WHERE status = 'processed'
-            """
-        )
-        self.conn.commit()
+        self._processed_since_gc += 1
+        if self._processed_since_gc >= PROCESSED_GC_THRESHOLD:
+            self.delete_processed_messages()
 
-    def get_all_messages(self) -> List[Dict[str, Any]]:
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM messages ORDER BY timestamp ASC")
-        return [dict(row) for row in cursor.fetchall()]
+    @_serialized
+    def delete_processed_messages(self) -> int:
+        """Delete processed messages in short batches and return how many were removed"""
+        deleted = 0
+        while True:
+            cursor = self.conn.execute(DELETE_PROCESSED_BATCH_SQL, (PROCESSED_GC_BATCH,))
+            self.conn.commit()
+            if cursor.rowcount <= 0:
+                break
+            deleted += cursor.rowcount
+
+        self._processed_since_gc = 0
+        return deleted
+
+    async def _run_in_thread(self, method, *args):
+        """Run a blocking method in the default executor so the event loop keeps running"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(method, *args))
+
+    async def insert_message_async(self, sender_id: str, receiver_id: str, type: str, content: str, request_id: str = None) -> int:
+        return await self._run_in_thread(self.insert_message, sender_id, receiver_id, type, content, request_id)
+
+    async def insert_messages_async(self, messages: List[tuple]) -> int:
+        return await self._run_in_thread(self.insert_messages, messages)
+
+    async def get_pending_messages_async(self, receiver_id: str) -> List[Message]:
+        return await self._run_in_thread(self.get_pending_messages, receiver_id)
+
+    async def mark_message_as_processed_async(self, message_id: int):
+        return await self._run_in_thread(self.mark_message_as_processed, message_id)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._run_in_thread(self.close)
+
+    def get_all_messages(self) -> List[Message]:
+        return [Message(*row) for row in self.conn.execute(SELECT_ALL_SQL).fetchall()]
 
 if __name__ == '__main__':
     # Example Usage (in-memory database for testing)
@@ -5,11 +5,14 @@ Manages Docker container-based agent execution with scaling and orchestration
 """
 
 import asyncio
+import functools
 import logging
 import os
 import signal
 import subprocess
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 import docker
@@ -23,6 +26,58 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Worker threads for blocking docker-py calls made from async methods. The
+# client's connection pool is sized to match so concurrent calls don't queue
+# behind docker-py's default 10 pooled connections
+DOCKER_EXECUTOR_WORKERS = 16
+DOCKER_API_TIMEOUT = 120
+
+# Always left out of the build context, on top of .dockerignore. Docker's ignore
+# patterns are anchored at the context root, so nested caches need the ** forms
+CONTEXT_EXCLUDES = ('.git', 'output', '.dockercache', '**/__pycache__', '**/*.py[cod]', '**/*.log')
+
+# Log one build output line out of this many while streaming a build
+BUILD_LOG_EVERY = 50
+
+# Drone containers created ahead of need (but never started) beyond the active
+# count; scaling up into them is a start instead of a create. Off by default.
+# They don't run the agent until started, so they never register in Redis.
+# Drones stopped by a scale-down inside the pool window are kept as the pool
+DRONE_POOL_SIZE = int(os.environ.get("OLLAMA_DRONE_POOL_SIZE", "0"))
+
+# Seconds between SIGTERM and SIGKILL when stopping containers. Drones hold no
+# state worth a long grace period; Redis gets a few seconds to flush its AOF
+DRONE_STOP_TIMEOUT = 2
+REDIS_STOP_TIMEOUT = 5
+DEFAULT_STOP_TIMEOUT = 10
+
+# Upper bound on how much log output get_container_logs() reads
+LOG_READ_LIMIT = 256 * 1024
+
+# Where start_redis() reaches the published Redis port to check it answers
+REDIS_PROBE_HOST = os.environ.get("OLLAMA_REDIS_PROBE_HOST", "127.0.0.1")
+
+# Label put on every container this manager creates
+CONTAINER_LABEL = "ollama-flow"
+
+# How long cleanup() waits for the event consumer to notice its stream closed
+EVENTS_SHUTDOWN_TIMEOUT = 5.0
+
+# Container event actions mapped to the state they leave the container in
+CONTAINER_EVENT_STATUS = {
+    'create': 'created',
+    'start': 'running',
+    'restart': 'running',
+    'unpause': 'running',
+    'pause': 'paused',
+    'die': 'exited',
+    'stop': 'exited',
+    'kill': 'exited',
+}
+
+# How long a container lookup by name is reused before asking the daemon again
+CONTAINER_CACHE_TTL = 5.0
+
 class DockerManager:
     """Manages Docker containers for AI agent execution"""
     
@@ -32,87 +87,249 @@ class DockerManager:
         self.containers = {}
         self.networks = {}
         self.volumes = {}
+        self._known_images = set()
+        self._images_listed = False
+        self._build_context = None
+        self._container_cache: Dict[str, tuple] = {}
+        self._drone_pool: Dict[int, Any] = {}
+        # Container name -> status summary, kept current from the daemon's event stream
+        self._container_status: Dict[str, Dict[str, str]] = {}
+        self._events_stream = None
+        self._events_task: Optional[asyncio.Future] = None
         self.shutdown_event = asyncio.Event()
         
+        # docker-py is synchronous; its calls run here so the event loop stays free
+        self._executor = ThreadPoolExecutor(max_workers=DOCKER_EXECUTOR_WORKERS,
+                                            thread_name_prefix="docker-manager")
+        
         # Configuration
         self.image_name = "ollama-flow"
         self.network_name = "ollama-flow-net"
         self.redis_container_name = "ollama-flow-redis"
+        # Pulled through a registry mirror to avoid Docker Hub rate limits
+        self.redis_image = os.environ.get("OLLAMA_REDIS_IMAGE", "mirror.gcr.io/library/redis:7.2-alpine")
+        self._redis_pull: Optional[asyncio.Future] = None
+        # Registry shared by drone hosts: built images are pushed there and other
+        # hosts pull them instead of building again
+        self.registry: Optional[str] = os.environ.get("OLLAMA_FLOW_REGISTRY")
+        
+        # Container settings shared by every app/drone start, built once here.
+        # docker-py only reads them, so the same objects are passed each time
+        self._base_env = {
+            'PYTHONUNBUFFERED': '1',
+            'REDIS_HOST': self.redis_container_name,
+            'REDIS_PORT': '6379',
+            'OLLAMA_HOST': 'host.docker.internal:11434',
+            'DOCKER_MODE': 'true'
+        }
+        self._drone_env = {**self._base_env, 'AGENT_MODE': 'drone'}
+        self._data_bind = {'bind': '/app/data', 'mode': 'rw'}
+        self._logs_bind = {'bind': '/app/logs', 'mode': 'rw'}
+        self._output_dir = str(self.project_root / "output")
         
         logger.info(f"Docker Manager initialized for project: {self.project_root}")
     
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking docker-py call on the manager's executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+    
     async def initialize(self):
         """Initialize Docker client and check Docker availability"""
         try:
-            self.docker_client = docker.from_env()
+            self.docker_client = await self._run(
+                docker.from_env,
+                max_pool_size=DOCKER_EXECUTOR_WORKERS,
+                timeout=DOCKER_API_TIMEOUT
+            )
             
             # Test Docker connection
-            self.docker_client.ping()
+            await self._run(self.docker_client.ping)
             logger.info("Docker connection established successfully")
             
             # Get Docker info
-            docker_info = self.docker_client.info()
+            docker_info = await self._run(self.docker_client.info)
             logger.info(f"Docker version: {docker_info.get('ServerVersion', 'unknown')}")
             
+            # Track container states from the event stream instead of polling
+            await self._start_container_events()
+            
         except DockerException as e:
             logger.error(f"Docker initialization failed: {e}")
             raise
     
+    async def _start_container_events(self):
+        """Subscribe to container events, seed the status cache, then follow the stream"""
+        try:
+            # The stream is open before the snapshot, so no change in between is lost,
+            # and before the consumer starts, so cleanup() can always close it
+            self._events_stream = await self._run(
+                self.docker_client.events, decode=True, filters={'type': 'container'}
+            )
+            await self._run(self._refresh_container_status)
+        except Exception as e:
+            # get_container_stats() lists containers itself without the consumer
+            logger.warning(f"Not following container events: {e}")
+            if self._events_stream is not None:
+                self._events_stream.close()
+                self._events_stream = None
+            return
+        
+        self._events_task = asyncio.ensure_future(self._run(self._consume_container_events))
+    
     async def build_images(self, rebuild: bool = False):
         """Build Docker images for Ollama Flow"""
         try:
             logger.info("Building Docker images...")
             
             # Build main image
-            if rebuild or not self._image_exists(self.image_name):
+            if not rebuild and await self._run(self._image_exists, self.image_name):
+                logger.info(f"Using existing image: {self.image_name}")
+            elif not rebuild and await self._run(self._pull_from_registry, self.image_name):
+                logger.info(f"Pulled image {self.image_name} from {self.registry}")
+            else:
                 logger.info(f"Building main image: {self.image_name}")
-                image, logs = self.docker_client.images.build(
-                    path=str(self.project_root),
-                    tag=self.image_name,
-                    rm=True,
-                    nocache=rebuild
-                )
-                
-                # Log build output
-                for log in logs:
-                    if 'stream' in log:
-                        logger.info(log['stream'].strip())
-                
+                await self._run(self._stream_build, self.image_name, rebuild)
                 logger.info(f"Successfully built image: {self.image_name}")
-            else:
-                logger.info(f"Using existing image: {self.image_name}")
+                await self._run(self._push_to_registry, self.image_name)
             
             # Build development image
             dev_image_name = f"{self.image_name}-dev"
-            if rebuild or not self._image_exists(dev_image_name):
+            if rebuild or not (await self._run(self._image_exists, dev_image_name) or
+                               await self._run(self._pull_from_registry, dev_image_name)):
                 logger.info(f"Building development image: {dev_image_name}")
-                image, logs = self.docker_client.images.build(
-                    path=str(self.project_root),
-                    dockerfile="Dockerfile.dev",
-                    tag=dev_image_name,
-                    rm=True,
-                    nocache=rebuild
-                )
+                await self._run(self._stream_build, dev_image_name, rebuild,
+                                dockerfile="Dockerfile.dev")
                 logger.info(f"Successfully built development image: {dev_image_name}")
+                await self._run(self._push_to_registry, dev_image_name)
             
         except DockerException as e:
             logger.error(f"Failed to build Docker images: {e}")
             raise
+        finally:
+            # The context is reused across this call's builds only; files may change later
+            if self._build_context is not None:
+                self._build_context.close()
+                self._build_context = None
     
-    def _image_exists(self, image_name: str) -> bool:
-        """Check if a Docker image exists"""
+    def _make_context_tar(self):
+        """Tar and gzip the project once, applying .dockerignore and CONTEXT_EXCLUDES"""
+        exclude = list(CONTEXT_EXCLUDES)
+        dockerignore = self.project_root / ".dockerignore"
+        if dockerignore.exists():
+            exclude += [line.strip() for line in dockerignore.read_text().splitlines()
+                        if line.strip() and not line.startswith('#')]
+        # Both Dockerfiles have to be in the context whatever the ignore rules say
+        exclude += ['!Dockerfile', '!Dockerfile.dev']
+        return docker.utils.tar(str(self.project_root), exclude=exclude, gzip=True)
+    
+    def _stream_build(self, tag: str, rebuild: bool, dockerfile: Optional[str] = None) -> Optional[str]:
+        """Build an image from the low-level API stream and return its id"""
+        # The main and dev images share one context archive
+        if self._build_context is None:
+            self._build_context = self._make_context_tar()
+        self._build_context.seek(0)
+        
+        stream = self.docker_client.api.build(
+            fileobj=self._build_context,
+            custom_context=True,
+            encoding='gzip',
+            dockerfile=dockerfile,
+            tag=tag,
+            rm=True,
+            nocache=rebuild,
+            decode=True,
+            **self._build_cache_options(tag, rebuild)
+        )
+        
+        image_id = None
+        lines = 0
+        for chunk in stream:
+            if 'error' in chunk:
+                raise docker.errors.BuildError(chunk['error'], [chunk])
+            if 'aux' in chunk and 'ID' in chunk['aux']:
+                image_id = chunk['aux']['ID']
+            if 'stream' in chunk:
+                # Only every Nth line is logged; a long build emits thousands
+                if lines % BUILD_LOG_EVERY == 0:
+                    logger.info(chunk['stream'].strip())
+                lines += 1
+        
+        self._known_images.add(tag)
+        return image_id
+    
+    def _pull_from_registry(self, tag: str) -> bool:
+        """Pull tag from the shared registry and tag it locally; False if unavailable"""
+        if not self.registry:
+            return False
         try:
-            self.docker_client.images.get(image_name)
-            return True
-        except docker.errors.ImageNotFound:
+            image = self.docker_client.images.pull(f"{self.registry}/{tag}", tag="latest")
+        except DockerException as e:
+            logger.info(f"{tag} not available from {self.registry}: {e}")
             return False
+        image.tag(tag)
+        self._known_images.update((tag, f"{self.registry}/{tag}"))
+        return True
+    
+    def _push_to_registry(self, tag: str):
+        """Push a freshly built tag to the shared registry, if one is configured"""
+        if not self.registry:
+            return
+        remote = f"{self.registry}/{tag}"
+        self.docker_client.api.tag(tag, remote)
+        self._known_images.add(remote)
+        for chunk in self.docker_client.api.push(remote, stream=True, decode=True):
+            if 'error' in chunk:
+                raise DockerException(f"Pushing {remote} failed: {chunk['error']}")
+        logger.info(f"Pushed {remote}")
+    
+    def _build_cache_options(self, tag: str, rebuild: bool) -> Dict[str, Any]:
+        """Build kwargs that reuse layers from the previous build of tag
+        
+        api.build uses the classic builder, where cache_from replaces the local
+        layer cache instead of adding to it, so only images present locally are
+        listed, and none at all leaves the default cache in place.
+        """
+        if rebuild:
+            return {}
+        candidates = [tag]
+        if self.registry:
+            candidates.append(f"{self.registry}/{tag}")
+        cache_from = [image for image in candidates if self._image_exists(image)]
+        return {'cache_from': cache_from} if cache_from else {}
+    
+    def _ensure_image(self, image_name: str):
+        """Pull an image unless it is already present locally"""
+        if not self._image_exists(image_name):
+            logger.info(f"Pulling image: {image_name}")
+            self.docker_client.images.pull(image_name)
+            self._known_images.add(image_name)
+    
+    def _refresh_known_images(self):
+        """Record every locally tagged image with a single list call"""
+        for image in self.docker_client.api.images():
+            for tag in image.get('RepoTags') or []:
+                self._known_images.add(tag)
+                # Untagged references such as "ollama-flow" mean ":latest"
+                if tag.endswith(':latest'):
+                    self._known_images.add(tag[:-len(':latest')])
+        self._images_listed = True
+    
+    def _image_exists(self, image_name: str) -> bool:
+        """Check if a Docker image exists, using one cached listing of local images
+        
+        Builds and pulls made through this manager add to the cache as they finish.
+        """
+        if not self._images_listed:
+            self._refresh_known_images()
+        return image_name in self._known_images
     
     async def create_network(self):
         """Create Docker network for inter-container communication"""
         try:
             # Check if network already exists
             try:
-                network = self.docker_client.networks.get(self.network_name)
+                network = await self._run(self.docker_client.networks.get, self.network_name)
                 logger.info(f"Using existing network: {self.network_name}")
                 self.networks[self.network_name] = network
                 return network
@@ -121,7 +338,8 @@ class DockerManager:
             
             # Create new network
             logger.info(f"Creating Docker network: {self.network_name}")
-            network = self.docker_client.networks.create(
+            network = await self._run(
+                self.docker_client.networks.create,
                 self.network_name,
                 driver="bridge",
                 ipam=docker.types.IPAMConfig(
@@ -140,15 +358,28 @@ class DockerManager:
             logger.error(f"Failed to create network: {e}")
             raise
     
+    async def prepare_start(self):
+        """Create the network and shared volumes concurrently before any container starts"""
+        # Fetch the Redis image in the background; start_redis() waits for it
+        if self._redis_pull is None:
+            self._redis_pull = asyncio.ensure_future(self._run(self._ensure_image, self.redis_image))
+        
+        await asyncio.gather(
+            self.create_network(),
+            self._run(self._ensure_volume, "ollama-flow-redis-data"),
+            self._run(self._ensure_volume, "ollama-flow-data"),
+            self._run(self._ensure_volume, "ollama-flow-logs")
+        )
+    
     async def start_redis(self):
         """Start Redis container for enhanced database"""
         try:
             # Check if Redis container already exists
-            existing_container = self._get_container(self.redis_container_name)
+            existing_container = await self._run(self._get_container, self.redis_container_name)
             if existing_container:
                 if existing_container.status != "running":
                     logger.info("Starting existing Redis container...")
-                    existing_container.start()
+                    await self._run(existing_container.start)
                 else:
                     logger.info("Redis container already running")
                 self.containers[self.redis_container_name] = existing_container
@@ -158,35 +389,35 @@ class DockerManager:
             
             # Create volume for Redis data persistence
             volume_name = "ollama-flow-redis-data"
-            try:
-                volume = self.docker_client.volumes.get(volume_name)
-            except docker.errors.NotFound:
-                volume = self.docker_client.volumes.create(volume_name)
-                logger.info(f"Created volume: {volume_name}")
+            volume = await self._run(self._ensure_volume, volume_name)
+            
+            # Let the prefetch started in prepare_start() finish; the create pulls on its own otherwise
+            if self._redis_pull is not None:
+                try:
+                    await self._redis_pull
+                except DockerException as e:
+                    logger.warning(f"Prefetching {self.redis_image} failed: {e}")
             
             # Start Redis container
-            container = self.docker_client.containers.run(
-                "redis:7.2-alpine",
+            container = await self._run(
+                self._create_and_start,
+                self.redis_image,
                 name=self.redis_container_name,
                 ports={'6379/tcp': 6379},
                 volumes={volume_name: {'bind': '/data', 'mode': 'rw'}},
                 command="redis-server --appendonly yes",
                 network=self.network_name,
-                detach=True,
-                restart_policy={"Name": "unless-stopped"},
-                healthcheck={
-                    "test": ["CMD", "redis-cli", "ping"],
-                    "interval": 10_000_000_000,  # 10s in nanoseconds
-                    "timeout": 5_000_000_000,    # 5s in nanoseconds
-                    "retries": 3
-                }
+                # No container healthcheck: it would exec redis-cli inside the
+                # container forever. Readiness is probed once from here instead
+                restart_policy={"Name": "unless-stopped"}
             )
             
             self.containers[self.redis_container_name] = container
             logger.info(f"Redis container started: {container.id[:12]}")
             
-            # Wait for Redis to be healthy
+            # Wait for the container to run, then for Redis to answer
             await self._wait_for_container_health(container)
+            await self._wait_for_redis_ping()
             
             return container
             
@@ -200,10 +431,10 @@ class DockerManager:
             container_name = "ollama-flow-app"
             
             # Check if container already exists
-            existing_container = self._get_container(container_name)
+            existing_container = await self._run(self._get_container, container_name)
             if existing_container:
                 if existing_container.status != "running":
-                    existing_container.start()
+                    await self._run(existing_container.start)
                 else:
                     logger.info("Main app container already running")
                 self.containers[container_name] = existing_container
@@ -212,31 +443,23 @@ class DockerManager:
             logger.info("Starting main application container...")
             
             # Create necessary volumes
-            data_volume = self._ensure_volume("ollama-flow-data")
-            logs_volume = self._ensure_volume("ollama-flow-logs")
+            data_volume = await self._run(self._ensure_volume, "ollama-flow-data")
+            logs_volume = await self._run(self._ensure_volume, "ollama-flow-logs")
             
             # Environment variables
-            environment = {
-                'PYTHONUNBUFFERED': '1',
-                'REDIS_HOST': self.redis_container_name,
-                'REDIS_PORT': '6379',
-                'OLLAMA_HOST': 'host.docker.internal:11434',
-                'DOCKER_MODE': 'true'
-            }
-            
             # Start main app container
-            container = self.docker_client.containers.run(
+            container = await self._run(
+                self._create_and_start,
                 self.image_name,
                 name=container_name,
                 ports={f'{port}/tcp': port},
-                environment=environment,
+                environment=self._base_env,
                 volumes={
-                    data_volume.name: {'bind': '/app/data', 'mode': 'rw'},
-                    logs_volume.name: {'bind': '/app/logs', 'mode': 'rw'},
-                    str(self.project_root / "output"): {'bind': '/app/output', 'mode': 'rw'}
+                    data_volume.name: self._data_bind,
+                    logs_volume.name: self._logs_bind,
+                    self._output_dir: {'bind': '/app/output', 'mode': 'rw'}
                 },
                 network=self.network_name,
-                detach=True,
                 restart_policy={"Name": "unless-stopped"}
             )
             
@@ -254,10 +477,13 @@ class DockerManager:
         try:
             logger.info(f"Starting {count} agent drone containers...")
             
-            drones = []
-            for i in range(1, count + 1):
-                drone = await self._start_agent_drone(i)
-                drones.append(drone)
+            # Create all drones concurrently; the daemon handles the requests in parallel
+            results = await asyncio.gather(
+                *(self._start_agent_drone(i) for i in range(1, count + 1)),
+                return_exceptions=True
+            )
+            drones = self._raise_first_failure(results, "start agent drone")
+            await self._rebalance_drone_pool(count)
             
             logger.info(f"Successfully started {len(drones)} agent drones")
             return drones
@@ -270,90 +496,347 @@ class DockerManager:
         """Start a single agent drone container"""
         container_name = f"ollama-flow-drone-{drone_id}"
         
+        pooled = self._drone_pool.pop(drone_id, None)
+        if pooled is not None:
+            await self._run(pooled.start)
+            self.containers[container_name] = pooled
+            logger.info(f"Agent drone {drone_id} started from warm pool")
+            return pooled
+        
         # Check if drone already exists
-        existing_container = self._get_container(container_name)
+        existing_container = await self._run(self._get_container, container_name)
         if existing_container:
-            if existing_container.status != "running":
-                existing_container.start()
+            if existing_container.status == "paused":
+                await self._run(existing_container.unpause)
+            elif existing_container.status != "running":
+                await self._run(existing_container.start)
             else:
                 logger.info(f"Drone {drone_id} already running")
             self.containers[container_name] = existing_container
             return existing_container
         
+        container = await self._run_agent_drone(drone_id)
+        
+        self.containers[container_name] = container
+        logger.info(f"Agent drone {drone_id} started: {container.id[:12]}")
+        
+        return container
+    
+    async def _run_agent_drone(self, drone_id: int, start: bool = True):
+        """Create a new drone container, and start it unless start is False"""
+        container_name = f"ollama-flow-drone-{drone_id}"
+        
         # Environment for this drone
-        environment = {
-            'PYTHONUNBUFFERED': '1',
-            'REDIS_HOST': self.redis_container_name,
-            'REDIS_PORT': '6379',
-            'OLLAMA_HOST': 'host.docker.internal:11434',
-            'DOCKER_MODE': 'true',
-            'AGENT_MODE': 'drone',
-            'DRONE_ID': str(drone_id)
-        }
+        environment = {**self._drone_env, 'DRONE_ID': str(drone_id)}
         
-        # Create volumes
-        data_volume = self._ensure_volume("ollama-flow-data")
-        logs_volume = self._ensure_volume("ollama-flow-logs")
+        # Create volumes. Data is shared between drones, but each drone gets its
+        # own logs volume so log writes don't contend on a single shared mount
+        data_volume = await self._run(self._ensure_volume, "ollama-flow-data")
+        logs_volume = await self._run(self._ensure_volume, f"{container_name}-logs")
         
         # Start drone container
-        container = self.docker_client.containers.run(
+        return await self._run(
+            self._create_and_start,
             self.image_name,
             name=container_name,
             environment=environment,
             volumes={
-                data_volume.name: {'bind': '/app/data', 'mode': 'rw'},
-                logs_volume.name: {'bind': '/app/logs', 'mode': 'rw'}
+                data_volume.name: self._data_bind,
+                logs_volume.name: self._logs_bind
             },
             network=self.network_name,
             command=["python3", "agents/docker_drone_agent.py"],
-            detach=True,
-            restart_policy={"Name": "unless-stopped"}
+            restart_policy={"Name": "unless-stopped"},
+            start=start
         )
+    
+    async def _warm_agent_drone(self, drone_id: int):
+        """Create a drone without starting it so it waits in the warm pool"""
+        container = await self._run(self._get_container, f"ollama-flow-drone-{drone_id}")
+        if container is None:
+            container = await self._run_agent_drone(drone_id, start=False)
+        elif container.status != "created":
+            # Already running (or stopped) outside the pool; _start_agent_drone reuses it
+            return
         
-        self.containers[container_name] = container
-        logger.info(f"Agent drone {drone_id} started: {container.id[:12]}")
+        self._drone_pool[drone_id] = container
+        logger.info(f"Agent drone {drone_id} created for the warm pool")
+    
+    async def _rebalance_drone_pool(self, active_count: int):
+        """Keep the next DRONE_POOL_SIZE drone ids after active_count created in the pool"""
+        wanted = range(active_count + 1, active_count + DRONE_POOL_SIZE + 1)
+        
+        surplus = [drone_id for drone_id in self._drone_pool if drone_id not in wanted]
+        await asyncio.gather(*(self._stop_container(f"ollama-flow-drone-{drone_id}",
+                                                    self._drone_pool.pop(drone_id))
+                               for drone_id in surplus))
+        
+        # The pool is an optimisation, so failing to warm a drone is only logged
+        results = await asyncio.gather(
+            *(self._warm_agent_drone(drone_id) for drone_id in wanted
+              if drone_id not in self._drone_pool),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to warm agent drone: {result}")
+    
+    def _create_and_start(self, image: str, name: str, ports: Optional[Dict[str, int]] = None,
+                          volumes: Optional[Dict[str, Dict[str, str]]] = None,
+                          network: Optional[str] = None,
+                          restart_policy: Optional[Dict[str, str]] = None,
+                          start: bool = True, **create_kwargs):
+        """Create and start a detached container through the low-level API
+        
+        Makes the same create/inspect/start requests as containers.run(detach=True),
+        but inspects after the start so the returned status is current. With
+        start=False the container is only created.
+        """
+        api = self.docker_client.api
+        host_config = api.create_host_config(
+            port_bindings=ports,
+            binds=volumes,
+            network_mode=network,
+            restart_policy=restart_policy
+        )
+        if ports:
+            create_kwargs['ports'] = [tuple(port.split('/', 1)) for port in ports]
+        if volumes:
+            create_kwargs['volumes'] = [bind['bind'] for bind in volumes.values()]
+        
+        try:
+            response = api.create_container(image, name=name, host_config=host_config,
+                                            labels={CONTAINER_LABEL: "1"}, **create_kwargs)
+        except docker.errors.ImageNotFound:
+            logger.info(f"Pulling image: {image}")
+            self.docker_client.images.pull(image)
+            self._known_images.add(image)
+            response = api.create_container(image, name=name, host_config=host_config,
+                                            labels={CONTAINER_LABEL: "1"}, **create_kwargs)
         
+        if start:
+            api.start(response['Id'])
+        
+        # Callers get a full Container (status etc.), so inspect once after the start
+        container = self.docker_client.containers.prepare_model({'Id': response['Id'], 'Name': name})
+        container.reload()
         return container
     
+    def _raise_first_failure(self, results: List[Any], action: str) -> List[Any]:
+        """Log every exception in gathered results, re-raise the first, else return them"""
+        failures = [result for result in results if isinstance(result, BaseException)]
+        for failure in failures:
+            logger.error(f"Failed to {action}: {failure}")
+        if failures:
+            raise failures[0]
+        return results
+    
     def _get_container(self, name: str):
-        """Get existing container by name"""
+        """Get existing container by name, reusing lookups for CONTAINER_CACHE_TTL seconds"""
+        cached = self._container_cache.get(name)
+        if cached and time.monotonic() - cached[1] < CONTAINER_CACHE_TTL:
+            return cached[0]
+        
         try:
-            return self.docker_client.containers.get(name)
+            container = self.docker_client.containers.get(name)
         except docker.errors.NotFound:
+            # Not cached: the caller is about to create it
             return None
+        self._container_cache[name] = (container, time.monotonic())
+        return container
     
     def _ensure_volume(self, volume_name: str):
-        """Ensure a Docker volume exists"""
+        """Ensure a Docker volume exists (cached in self.volumes once found)"""
+        volume = self.volumes.get(volume_name)
+        if volume is not None:
+            return volume
+        
         try:
-            return self.docker_client.volumes.get(volume_name)
+            volume = self.docker_client.volumes.get(volume_name)
         except docker.errors.NotFound:
             volume = self.docker_client.volumes.create(volume_name)
             logger.info(f"Created volume: {volume_name}")
-            return volume
+        self.volumes[volume_name] = volume
+        return volume
+    
+    @staticmethod
+    def _container_readiness(state: Dict[str, Any]) -> Optional[str]:
+        """Classify a container State as 'healthy', 'running', 'failed' or None (not yet)"""
+        health_status = state.get('Health', {}).get('Status')
+        if health_status == 'healthy':
+            return 'healthy'
+        if health_status == 'unhealthy' or state.get('Status') in ('exited', 'dead'):
+            return 'failed'
+        if state.get('Status') == 'running':
+            return 'running'
+        return None
+    
+    def _wait_for_container_event(self, container_id: str, since: float, until: float) -> Optional[str]:
+        """Block on the daemon's event stream until the container is ready or fails"""
+        events = self.docker_client.events(
+            decode=True,
+            since=int(since),
+            until=int(until) + 1,
+            filters={'type': 'container', 'container': container_id}
+        )
+        try:
+            for event in events:
+                action = event.get('Action', '')
+                if action == 'health_status: healthy':
+                    return 'healthy'
+                if action == 'start':
+                    return 'running'
+                if action in ('health_status: unhealthy', 'die', 'oom'):
+                    return 'failed'
+        finally:
+            events.close()
+        return None
     
     async def _wait_for_container_health(self, container, timeout: int = 60):
-        """Wait for container to become healthy"""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            container.reload()
-            
-            if hasattr(container.attrs, 'State') and 'Health' in container.attrs['State']:
-                health_status = container.attrs['State']['Health']['Status']
-                if health_status == 'healthy':
-                    logger.info(f"Container {container.name} is healthy")
-                    return True
-                elif health_status == 'unhealthy':
-                    raise Exception(f"Container {container.name} became unhealthy")
-            
-            # If no health check, just check if running
-            if container.status == 'running':
-                await asyncio.sleep(2)  # Give it a moment to start properly
-                return True
-            
-            await asyncio.sleep(1)
+        """Wait for container to become healthy (or running), driven by Docker events"""
+        # Events are replayed from before the state check, so no transition is missed
+        since = time.time()
+        # Only State is needed, so skip refreshing the whole Container model
+        inspect = await self._run(self.docker_client.api.inspect_container, container.id)
+        readiness = self._container_readiness(inspect.get('State', {}))
+        
+        if readiness is None:
+            readiness = await self._run(self._wait_for_container_event, container.id,
+                                        since, since + timeout)
+        
+        if readiness == 'healthy':
+            logger.info(f"Container {container.name} is healthy")
+            return True
+        if readiness == 'running':
+            # Without a healthcheck, callers probe the service itself if they need to
+            return True
+        if readiness == 'failed':
+            raise Exception(f"Container {container.name} became unhealthy")
         
         raise Exception(f"Container {container.name} failed to become healthy within {timeout}s")
     
+    async def _wait_for_redis_ping(self, timeout: float = 30.0):
+        """Poll the published Redis port until it answers PING"""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(REDIS_PROBE_HOST, 6379)
+                try:
+                    writer.write(b"*1\r\n$4\r\nPING\r\n")
+                    await writer.drain()
+                    reply = await asyncio.wait_for(reader.readline(), timeout=5)
+                finally:
+                    writer.close()
+                if reply.startswith(b"+PONG"):
+                    logger.info("Redis is answering PING")
+                    return
+            except (OSError, asyncio.TimeoutError):
+                pass
+            
+            if time.monotonic() >= deadline:
+                raise Exception(f"Redis did not answer PING within {timeout}s")
+            await asyncio.sleep(0.2)
+    
+    def _write_compose_yaml(self, drone_count: int, port: int) -> Path:
+        """Write a compose file describing the same stack the start_* methods create"""
+        
+        services = {
+            'redis': {
+                'image': self.redis_image,
+                'container_name': self.redis_container_name,
+                'ports': ['6379:6379'],
+                'volumes': ['redis-data:/data'],
+                'command': 'redis-server --appendonly yes',
+                'networks': [self.network_name],
+                'restart': 'unless-stopped',
+                'labels': {CONTAINER_LABEL: '1'}
+            },
+            'app': {
+                'image': self.image_name,
+                'container_name': 'ollama-flow-app',
+                'ports': [f'{port}:{port}'],
+                'environment': dict(self._base_env),
+                'volumes': ['data:/app/data', 'logs:/app/logs',
+                            f'{self._output_dir}:/app/output'],
+                'depends_on': ['redis'],
+                'networks': [self.network_name],
+                'restart': 'unless-stopped',
+                'labels': {CONTAINER_LABEL: '1'}
+            }
+        }
+        volumes = {
+            'redis-data': {'name': 'ollama-flow-redis-data'},
+            'data': {'name': 'ollama-flow-data'},
+            'logs': {'name': 'ollama-flow-logs'}
+        }
+        
+        # One service per drone: each needs its own DRONE_ID, which --scale can't give
+        for drone_id in range(1, drone_count + 1):
+            services[f'drone-{drone_id}'] = {
+                'image': self.image_name,
+                'container_name': f'ollama-flow-drone-{drone_id}',
+                'environment': {**self._drone_env, 'DRONE_ID': str(drone_id)},
+                'volumes': ['data:/app/data', f'drone-{drone_id}-logs:/app/logs'],
+                'command': ['python3', 'agents/docker_drone_agent.py'],
+                'depends_on': ['redis'],
+                'networks': [self.network_name],
+                'restart': 'unless-stopped',
+                'labels': {CONTAINER_LABEL: '1'}
+            }
+            volumes[f'drone-{drone_id}-logs'] = {'name': f'ollama-flow-drone-{drone_id}-logs'}
+        
+        compose = {
+            'services': services,
+            'volumes': volumes,
+            # Created by create_network() so both startup paths share it
+            'networks': {self.network_name: {'external': True}}
+        }
+        
+        # Every path above is absolute and the project is named with -p, so the
+        # file can live outside the tree instead of cluttering the checkout
+        with tempfile.NamedTemporaryFile('w', prefix='ollama-flow-compose-', suffix='.yml',
+                                         delete=False) as f:
+            yaml.safe_dump(compose, f, sort_keys=False)
+        return Path(f.name)
+    
+    async def start_with_compose(self, drone_count: int = 4, port: int = 8080) -> bool:
+        """Start Redis, the app and drones in one `docker compose up`
+        
+        Compose starts services that don't depend on each other in parallel.
+        Returns False when compose is unavailable or fails, so callers can fall
+        back to start_redis/start_main_app/start_agent_drones.
+        """
+        compose_file = await self._run(self._write_compose_yaml, drone_count, port)
+        
+        try:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "docker", "compose", "-f", str(compose_file), "-p", "ollama-flow", "up", "-d",
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE
+                )
+            except FileNotFoundError:
+                logger.warning("docker CLI not found; starting containers individually")
+                return False
+            
+            _, stderr = await process.communicate()
+        finally:
+            compose_file.unlink(missing_ok=True)
+        
+        if process.returncode != 0:
+            logger.warning(f"docker compose up failed: {stderr.decode('utf-8', errors='replace').strip()}")
+            return False
+        
+        names = [self.redis_container_name, "ollama-flow-app"] + \
+            [f"ollama-flow-drone-{drone_id}" for drone_id in range(1, drone_count + 1)]
+        for name in names:
+            container = await self._run(self._get_container, name)
+            if container is not None:
+                self.containers[name] = container
+        
+        logger.info(f"Started stack with docker compose ({drone_count} drones)")
+        return True
+    
     async def scale_drones(self, target_count: int):
         """Scale agent drones to target count"""
         try:
@@ -365,12 +848,25 @@ class DockerManager:
             
             if target_count > current_count:
                 # Scale up
-                for i in range(current_count + 1, target_count + 1):
-                    await self._start_agent_drone(i)
+                results = await asyncio.gather(
+                    *(self._start_agent_drone(i) for i in range(current_count + 1, target_count + 1)),
+                    return_exceptions=True
+                )
+                self._raise_first_failure(results, "start agent drone")
             elif target_count < current_count:
-                # Scale down
-                for i in range(target_count + 1, current_count + 1):
-                    await self._stop_agent_drone(i)
+                # Scale down. Running drones are always stopped: they have registered
+                # as available, so parking them would leave them advertised. Those
+                # that fall in the new pool window are kept, stopped, as the pool
+                # instead of being removed and created again by the rebalance
+                pool_ids = range(target_count + 1, target_count + DRONE_POOL_SIZE + 1)
+                results = await asyncio.gather(
+                    *(self._stop_agent_drone(i, keep=i in pool_ids)
+                      for i in range(target_count + 1, current_count + 1)),
+                    return_exceptions=True
+                )
+                self._raise_first_failure(results, "stop agent drone")
+            
+            await self._rebalance_drone_pool(target_count)
             
             logger.info(f"Successfully scaled to {target_count} drones")
             
@@ -378,79 +874,192 @@ class DockerManager:
             logger.error(f"Failed to scale drones: {e}")
             raise
     
-    async def _stop_agent_drone(self, drone_id: int):
-        """Stop a specific agent drone"""
+    async def _stop_agent_drone(self, drone_id: int, keep: bool = False):
+        """Stop a specific agent drone, removing it unless keep puts it in the pool"""
         container_name = f"ollama-flow-drone-{drone_id}"
         
         if container_name in self.containers:
             container = self.containers[container_name]
             logger.info(f"Stopping drone {drone_id}...")
-            container.stop(timeout=30)
-            container.remove()
+            await self._run(container.stop, timeout=DRONE_STOP_TIMEOUT)
+            if keep:
+                # Starting it again re-runs the agent, which registers afresh
+                self._drone_pool[drone_id] = container
+            else:
+                await self._run(container.remove)
             del self.containers[container_name]
-            logger.info(f"Drone {drone_id} stopped and removed")
+            self._container_cache.pop(container_name, None)
+            logger.info(f"Drone {drone_id} stopped and {'kept in the pool' if keep else 'removed'}")
     
     async def stop_all(self):
         """Stop all managed containers"""
         try:
             logger.info("Stopping all containers...")
             
-            for name, container in list(self.containers.items()):
-                try:
-                    logger.info(f"Stopping container: {name}")
-                    container.stop(timeout=30)
-                    container.remove()
-                except Exception as e:
-                    logger.error(f"Error stopping container {name}: {e}")
+            # Stop containers concurrently, so shutdown takes as long as the slowest one
+            pooled = {f"ollama-flow-drone-{drone_id}": container
+                      for drone_id, container in self._drone_pool.items()}
+            await asyncio.gather(*(self._stop_container(name, container)
+                                   for name, container in {**self.containers, **pooled}.items()))
             
             self.containers.clear()
+            self._drone_pool.clear()
+            self._container_cache.clear()
             logger.info("All containers stopped")
             
         except Exception as e:
             logger.error(f"Error stopping containers: {e}")
     
+    async def _stop_container(self, name: str, container):
+        """Stop and remove one container in a worker thread, logging failures"""
+        if name.startswith("ollama-flow-drone-"):
+            timeout = DRONE_STOP_TIMEOUT
+        elif name == self.redis_container_name:
+            timeout = REDIS_STOP_TIMEOUT
+        else:
+            timeout = DEFAULT_STOP_TIMEOUT
+        
+        def stop_and_remove():
+            container.stop(timeout=timeout)
+            container.remove()
+        
+        try:
+            logger.info(f"Stopping container: {name}")
+            await self._run(stop_and_remove)
+        except Exception as e:
+            logger.error(f"Error stopping container {name}: {e}")
+    
     async def cleanup(self):
         """Cleanup all resources"""
         try:
             await self.stop_all()
             
+            # A prefetch nobody waited for (e.g. compose started Redis) is dropped;
+            # gathering it also retrieves its exception so it isn't reported as lost
+            if self._redis_pull is not None:
+                self._redis_pull.cancel()
+                await asyncio.gather(self._redis_pull, return_exceptions=True)
+            
+            # Closing the stream ends the consumer loop in its worker thread
+            if self._events_stream is not None:
+                self._events_stream.close()
+            if self._events_task is not None:
+                try:
+                    await asyncio.wait_for(asyncio.gather(self._events_task, return_exceptions=True),
+                                           timeout=EVENTS_SHUTDOWN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning("Container event consumer did not stop in time")
+            
             # Remove network
             if self.network_name in self.networks:
                 try:
-                    self.networks[self.network_name].remove()
+                    await self._run(self.networks[self.network_name].remove)
                     logger.info(f"Removed network: {self.network_name}")
                 except Exception as e:
                     logger.error(f"Error removing network: {e}")
             
             # Close Docker client
             if self.docker_client:
-                self.docker_client.close()
+                await self._run(self.docker_client.close)
+            
+            self._executor.shutdown(wait=False)
             
             logger.info("Docker cleanup completed")
             
         except Exception as e:
             logger.error(f"Error during cleanup: {e}")
     
-    def get_container_logs(self, container_name: str, tail: int = 50) -> str:
-        """Get logs from a specific container"""
-        if container_name in self.containers:
-            container = self.containers[container_name]
-            return container.logs(tail=tail).decode('utf-8')
-        return f"Container {container_name} not found"
+    async def get_container_logs(self, container_name: str, tail: int = 50,
+                                 since_seconds: int = 3600) -> str:
+        """Get recent logs from a specific container, capped at LOG_READ_LIMIT bytes"""
+        if container_name not in self.containers:
+            return f"Container {container_name} not found"
+        container = self.containers[container_name]
+        
+        def read_logs() -> str:
+            stream = self.docker_client.api.logs(
+                container.id,
+                stream=True,
+                # docker-py follows whenever stream=True unless told otherwise,
+                # which never ends for a running container
+                follow=False,
+                timestamps=False,
+                tail=tail,
+                since=int(time.time()) - since_seconds
+            )
+            chunks = []
+            size = 0
+            try:
+                for chunk in stream:
+                    chunks.append(chunk)
+                    size += len(chunk)
+                    if size >= LOG_READ_LIMIT:
+                        break
+            finally:
+                stream.close()
+            return b''.join(chunks)[:LOG_READ_LIMIT].decode('utf-8', errors='replace')
+        
+        return await self._run(read_logs)
+    
+    def _refresh_container_status(self):
+        """Rebuild the status cache from one list call for every ollama-flow container"""
+        summaries = self.docker_client.api.containers(all=True, filters={'name': 'ollama-flow-'})
+        self._container_status = {
+            summary['Names'][0].lstrip('/'): {
+                'status': summary.get('State', 'unknown'),
+                'id': summary['Id'][:12],
+                'image': summary.get('Image') or 'unknown'
+            }
+            for summary in summaries if summary.get('Names')
+        }
+    
+    def _consume_container_events(self):
+        """Apply container state changes from the daemon's event stream until it is closed"""
+        try:
+            for event in self._events_stream:
+                self._apply_container_event(event)
+        except Exception as e:
+            # get_container_stats() falls back to listing once this has stopped
+            logger.warning(f"Stopped following container events: {e}")
+    
+    def _apply_container_event(self, event: Dict[str, Any]):
+        """Update the status cache from one container event"""
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        name = attributes.get('name', '')
+        # Filtered by name rather than CONTAINER_LABEL so containers that were
+        # created before the label existed are tracked too
+        if not name.startswith('ollama-flow-'):
+            return
+        
+        action = event.get('Action') or event.get('status', '')
+        if action == 'destroy':
+            self._container_status.pop(name, None)
+            return
+        status = CONTAINER_EVENT_STATUS.get(action)
+        if status is None:
+            return
+        self._container_status[name] = {
+            'status': status,
+            'id': event.get('id', '')[:12],
+            'image': attributes.get('image') or 'unknown'
+        }
     
     def get_container_stats(self) -> Dict[str, Any]:
         """Get statistics for all managed containers"""
-        stats = {}
-        for name, container in self.containers.items():
+        # Without the event consumer the cache isn't kept current, so list once now
+        if self._events_task is None or self._events_task.done():
             try:
-                container.reload()
-                stats[name] = {
-                    'status': container.status,
-                    'id': container.id[:12],
-                    'image': container.image.tags[0] if container.image.tags else 'unknown'
-                }
+                self._refresh_container_status()
             except Exception as e:
-                stats[name] = {'error': str(e)}
+                return {name: {'error': str(e)} for name in self.containers}
+        
+        stats = {}
+        for name in self.containers:
+            summary = self._container_status.get(name)
+            if summary is None:
+                stats[name] = {'error': f"Container {name} not found"}
+                continue
+            stats[name] = dict(summary)
         
         return stats
 
@@ -479,16 +1088,17 @@ async def main():
             await manager.build_images(rebuild=args.rebuild)
         
         if args.start:
-            await manager.create_network()
-            await manager.start_redis()
-            await manager.start_main_app()
-            await manager.start_agent_drones()
+            await manager.prepare_start()
+            if not await manager.start_with_compose():
+                # Redis and the app only depend on the network; drones come last
+                await asyncio.gather(manager.start_redis(), manager.start_main_app())
+                await manager.start_agent_drones()
         
         if args.scale is not None:
             await manager.scale_drones(args.scale)
         
         if args.logs:
-            logs = manager.get_container_logs(args.logs)
+            logs = await manager.get_container_logs(args.logs)
             print(logs)
         
         if args.stats:
@@ -10,6 +10,7 @@ import tempfile
 import json
 import threading
 import time
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 import requests
@@ -216,6 +217,52 @@ class TestSimpleDashboard:
             assert session_id not in dashboard.active_sessions
             assert len(dashboard.session_history) > 0
     
+    def test_session_popped_elsewhere_not_readded(self, dashboard):
+        """Test that run_session leaves a session another path already popped alone"""
+        session_id = "test_session_stop_race"
+        session_data = {
+            'id': session_id,
+            'name': 'Race Session',
+            'task': 'Test stop race',
+            'workers': 2,
+            'architecture': 'CENTRALIZED',
+            'model': 'test-model',
+            'status': 'starting',
+            'started_at': datetime.now().isoformat()
+        }
+        dashboard._add_active_session(session_id, session_data)
+        dashboard._start_session_background(session_data)
+        time.sleep(0.1)
+        
+        # A stop request that has popped the session but not yet flagged it
+        assert dashboard._pop_active_session(session_id) is session_data
+        
+        # Outlast the simulated run
+        time.sleep(2.5)
+        
+        assert session_id not in [s['id'] for s in dashboard.session_history]
+        assert dashboard._duration_count == 0
+    
+    def test_api_stats_avg_duration(self, dashboard):
+        """Test /api/stats average session duration"""
+        with dashboard.app.test_client() as client:
+            data = json.loads(client.get('/api/stats').data)
+            assert data['avg_duration_seconds'] is None
+
+            dashboard._record_session_duration(100)
+            dashboard._record_session_duration(61)
+            data = json.loads(client.get('/api/stats').data)
+            assert data['avg_duration_seconds'] == 80
+            assert data['avg_duration'] == '1m 20s'
+
+    def test_session_history_is_bounded(self):
+        """Test that old history entries are dropped past history_limit"""
+        dashboard = SimpleDashboard(host='localhost', port=5001, debug=False, history_limit=3)
+        for i in range(5):
+            dashboard.session_history.append({'id': f'session_{i}'})
+
+        assert [s['id'] for s in dashboard.session_history] == ['session_2', 'session_3', 'session_4']
+
     def test_socketio_integration(self, dashboard):
         """Test SocketIO integration if available"""
         # Test if SocketIO is properly integrated
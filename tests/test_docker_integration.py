@@ -88,6 +88,49 @@ class TestDockerManager:
             drones = await docker_manager.start_agent_drones(count=3)
             assert len(drones) == 3
             assert mock_start.call_count == 3
+    
+    def test_scale_down_keeps_stopped_drones_as_pool(self, docker_manager):
+        """Test that scaling down with a pool doesn't remove drones only to create them again"""
+        drones = {drone_id: Mock(id=f'drone{drone_id}') for drone_id in range(1, 5)}
+        for drone_id, container in drones.items():
+            docker_manager.containers[f'ollama-flow-drone-{drone_id}'] = container
+        
+        with patch('docker_manager.DRONE_POOL_SIZE', 2), \
+             patch.object(docker_manager, '_run_agent_drone') as mock_create:
+            asyncio.run(docker_manager.scale_drones(1))
+        
+        assert mock_create.call_count == 0
+        assert sum(container.remove.call_count for container in drones.values()) == 1
+        drones[4].remove.assert_called_once()
+        assert set(docker_manager._drone_pool) == {2, 3}
+        assert list(docker_manager.containers) == ['ollama-flow-drone-1']
+    
+    def test_build_cache_only_from_existing_images(self, docker_manager):
+        """Test that cache_from is only passed for images that exist locally"""
+        docker_manager.registry = 'registry.local:5000'
+        docker_manager._images_listed = True
+        
+        # Nothing to seed from: keep the builder's own layer cache
+        assert docker_manager._build_cache_options('ollama-flow', rebuild=False) == {}
+        
+        docker_manager._known_images.add('registry.local:5000/ollama-flow')
+        options = docker_manager._build_cache_options('ollama-flow', rebuild=False)
+        assert options == {'cache_from': ['registry.local:5000/ollama-flow']}
+        assert docker_manager._build_cache_options('ollama-flow', rebuild=True) == {}
+    
+    def test_container_logs_do_not_follow(self, docker_manager):
+        """Test that reading logs returns instead of following a running container"""
+        with patch.object(docker_manager, 'docker_client') as mock_client:
+            mock_stream = MagicMock()
+            mock_stream.__iter__.return_value = iter([b'line 1\n', b'line 2\n'])
+            mock_client.api.logs.return_value = mock_stream
+            docker_manager.containers['ollama-flow-app'] = Mock(id='test123')
+            
+            logs = asyncio.run(docker_manager.get_container_logs('ollama-flow-app'))
+            
+            assert logs == 'line 1\nline 2\n'
+            assert mock_client.api.logs.call_args.kwargs['follow'] is False
+            mock_stream.close.assert_called_once()
 
 class TestDockerDroneAgent:
     """Test Docker Drone Agent functionality"""
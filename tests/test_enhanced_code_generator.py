@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the enhanced code generator
+"""
+
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_code_generator import EnhancedCodeGenerator
+
+class TestResultCache(unittest.TestCase):
+    """Test the extract_and_validate_code result cache"""
+    
+    def setUp(self):
+        self.generator = EnhancedCodeGenerator()
+    
+    def _response(self, n):
+        return f"```python\nprint({n})\n```"
+    
+    def test_repeated_response_is_served_from_cache(self):
+        """Test that an identical response skips extraction the second time"""
+        first = self.generator.extract_and_validate_code(self._response(1), "task")
+        with patch.object(self.generator, '_extract_code_blocks') as mock_extract:
+            second = self.generator.extract_and_validate_code(self._response(1), "task")
+            mock_extract.assert_not_called()
+        self.assertEqual(first, second)
+    
+    def test_recently_used_entry_survives_eviction(self):
+        """Test that eviction drops the least recently used entry, not the oldest"""
+        with patch('enhanced_code_generator.RESULT_CACHE_SIZE', 3):
+            for n in range(3):
+                self.generator.extract_and_validate_code(self._response(n), "task")
+            
+            # Touch the oldest entry, then force one eviction
+            self.generator.extract_and_validate_code(self._response(0), "task")
+            self.generator.extract_and_validate_code(self._response(3), "task")
+            
+            with patch.object(self.generator, '_extract_code_blocks',
+                              wraps=self.generator._extract_code_blocks) as mock_extract:
+                self.generator.extract_and_validate_code(self._response(0), "task")
+                mock_extract.assert_not_called()
+                
+                self.generator.extract_and_validate_code(self._response(1), "task")
+                mock_extract.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()